@@ -8,6 +8,12 @@ Follows SessionCommands pattern from Phase 2-5.
 from typing import Optional
 from src.approval.manager import ApprovalManager
 
+# Response prefixes; IDs are appended by concatenation on the reply path
+_MSG_APPROVED = "✅ Approved "
+_MSG_REJECTED = "❌ Rejected "
+_MSG_APPROVED_ALL = "✅ Approved all pending ("
+_MSG_NOT_FOUND = "Error: Approval not found: "
+
 
 class ApprovalCommands:
     """
@@ -19,6 +25,13 @@ class ApprovalCommands:
     - approve all - Approve all pending operations
     """
 
+    _HELP_TEXT = (
+        "Approval Commands:\n"
+        "  approve {id} - Approve pending operation\n"
+        "  reject {id} - Reject pending operation\n"
+        "  approve all - Approve all pending operations"
+    )
+
     def __init__(self, manager: ApprovalManager):
         """
         Initialize ApprovalCommands.
@@ -38,34 +51,36 @@ class ApprovalCommands:
         Returns:
             Response message (None if unknown command)
         """
-        # Parse command
-        parts = message.strip().split()
+        # Dispatch on the first token; maxsplit=2 stops splitting after the
+        # argument, since every message is routed through here
+        parts = message.split(None, 2)
         if not parts:
             return None
 
-        command = parts[0].lower()
+        handler = self._COMMANDS.get(parts[0].lower())
+        if handler is None:
+            # Unknown command - let SessionCommands handle
+            return None
 
-        if command == "approve":
-            if len(parts) < 2:
-                return None  # Let SessionCommands handle
+        if len(parts) < 2:
+            return None  # Let SessionCommands handle
 
-            # Check for "approve all"
-            if parts[1].lower() == "all":
-                return await self._approve_all()
+        return await handler(self, parts[1])
 
-            # Regular "approve {id}"
-            approval_id = parts[1]
-            return await self._approve(approval_id)
+    async def _approve_command(self, argument: str) -> str:
+        """
+        Route "approve all" and "approve {id}".
 
-        elif command == "reject":
-            if len(parts) < 2:
-                return None  # Let SessionCommands handle
+        Args:
+            argument: Token following "approve"
 
-            approval_id = parts[1]
-            return await self._reject(approval_id)
+        Returns:
+            Success or error message
+        """
+        if argument.lower() == "all":
+            return await self._approve_all()
 
-        # Unknown command - let SessionCommands handle
-        return None
+        return await self._approve(argument)
 
     async def _approve(self, approval_id: str) -> str:
         """
@@ -80,9 +95,9 @@ class ApprovalCommands:
         try:
             self.manager.approve(approval_id)
             # Truncate ID to 8 chars for mobile-friendly display
-            return f"✅ Approved {approval_id[:8]}"
+            return _MSG_APPROVED + approval_id[:8]
         except KeyError:
-            return f"Error: Approval not found: {approval_id[:8]}"
+            return _MSG_NOT_FOUND + approval_id[:8]
 
     async def _reject(self, approval_id: str) -> str:
         """
@@ -97,9 +112,9 @@ class ApprovalCommands:
         try:
             self.manager.reject(approval_id)
             # Truncate ID to 8 chars for mobile-friendly display
-            return f"❌ Rejected {approval_id[:8]}"
+            return _MSG_REJECTED + approval_id[:8]
         except KeyError:
-            return f"Error: Approval not found: {approval_id[:8]}"
+            return _MSG_NOT_FOUND + approval_id[:8]
 
     async def _approve_all(self) -> str:
         """
@@ -109,7 +124,7 @@ class ApprovalCommands:
             Success message with count
         """
         count = self.manager.approve_all()
-        return f"✅ Approved all pending ({count})"
+        return f"{_MSG_APPROVED_ALL}{count})"
 
     def help(self) -> str:
         """
@@ -118,7 +133,10 @@ class ApprovalCommands:
         Returns:
             Help text with available commands
         """
-        return """Approval Commands:
-  approve {id} - Approve pending operation
-  reject {id} - Reject pending operation
-  approve all - Approve all pending operations"""
+        return self._HELP_TEXT
+
+    # First-token dispatch table for handle()
+    _COMMANDS = {
+        "approve": _approve_command,
+        "reject": _reject,
+    }
@@ -1,7 +1,8 @@
 """Operation detector for classifying Claude tool calls."""
 
 from enum import Enum
-from typing import Tuple
+from types import MappingProxyType
+from typing import Mapping, Tuple
 
 
 class OperationType(Enum):
@@ -11,14 +12,36 @@ class OperationType(Enum):
     DESTRUCTIVE = "destructive"
 
 
+# Classification reasons, shared by every classify() call
+_REASON_READ = "Read operations don't modify files - safe to execute"
+_REASON_GREP = "Searching content is read-only - safe to execute"
+_REASON_GLOB = "Listing files is read-only - safe to execute"
+_REASON_EDIT = "Edit modifies existing files - requires approval"
+_REASON_WRITE = "Write creates or overwrites files - requires approval"
+_REASON_BASH = "Shell commands can modify system state - requires approval"
+_REASON_MISSING_TOOL = "Missing tool name - defaulting to destructive for safety"
+
+# Lowercased tool name -> (OperationType, reason); one lookup per classify()
+_CLASSIFICATION: Mapping[str, Tuple[OperationType, str]] = MappingProxyType({
+    "read": (OperationType.SAFE, _REASON_READ),
+    "grep": (OperationType.SAFE, _REASON_GREP),
+    "glob": (OperationType.SAFE, _REASON_GLOB),
+    "edit": (OperationType.DESTRUCTIVE, _REASON_EDIT),
+    "write": (OperationType.DESTRUCTIVE, _REASON_WRITE),
+    "bash": (OperationType.DESTRUCTIVE, _REASON_BASH),
+})
+
+_MISSING_TOOL = (OperationType.DESTRUCTIVE, _REASON_MISSING_TOOL)
+
+
 class OperationDetector:
     """Detect and classify operations as safe or destructive."""
 
     # Safe operations - read-only, don't modify state
-    SAFE_TOOLS = {"read", "grep", "glob"}
+    SAFE_TOOLS = frozenset({"read", "grep", "glob"})
 
     # Destructive operations - can modify files or system state
-    DESTRUCTIVE_TOOLS = {"edit", "write", "bash"}
+    DESTRUCTIVE_TOOLS = frozenset({"edit", "write", "bash"})
 
     def classify(self, tool_call) -> Tuple[OperationType, str]:
         """
@@ -32,42 +55,17 @@ class OperationDetector:
         """
         # Handle missing tool name
         if not tool_call.tool:
-            return (
-                OperationType.DESTRUCTIVE,
-                "Missing tool name - defaulting to destructive for safety",
-            )
-
-        # Normalize tool name to lowercase for case-insensitive matching
-        tool_name = tool_call.tool.lower()
+            return _MISSING_TOOL
 
-        # Check if tool is safe
-        if tool_name in self.SAFE_TOOLS:
-            return self._classify_safe(tool_name)
+        # Parser ToolCalls carry a precomputed lowercase name; others don't
+        tool_name = getattr(tool_call, "_tool_lc", None) or tool_call.tool.lower()
 
-        # Check if tool is known destructive
-        if tool_name in self.DESTRUCTIVE_TOOLS:
-            return self._classify_destructive(tool_name)
+        classification = _CLASSIFICATION.get(tool_name)
+        if classification is not None:
+            return classification
 
         # Unknown tools default to destructive (fail-safe)
         return (
             OperationType.DESTRUCTIVE,
             f"Unknown tool '{tool_call.tool}' - defaulting to destructive for safety",
         )
-
-    def _classify_safe(self, tool_name: str) -> Tuple[OperationType, str]:
-        """Get classification for safe operations."""
-        reasons = {
-            "read": "Read operations don't modify files - safe to execute",
-            "grep": "Searching content is read-only - safe to execute",
-            "glob": "Listing files is read-only - safe to execute",
-        }
-        return (OperationType.SAFE, reasons[tool_name])
-
-    def _classify_destructive(self, tool_name: str) -> Tuple[OperationType, str]:
-        """Get classification for destructive operations."""
-        reasons = {
-            "edit": "Edit modifies existing files - requires approval",
-            "write": "Write creates or overwrites files - requires approval",
-            "bash": "Shell commands can modify system state - requires approval",
-        }
-        return (OperationType.DESTRUCTIVE, reasons[tool_name])
@@ -5,19 +5,63 @@ Manages approval requests from creation through approval/rejection/timeout.
 Follows Phase 2 session lifecycle pattern for state machine implementation.
 """
 
+import asyncio
+import itertools
+import os
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, UTC, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Mapping, Optional, Callable, Union
 
 from src.approval.models import ApprovalState
 
 
-@dataclass
+def _uuid4_str() -> str:
+    """Default approval ID: random UUID4 string."""
+    return str(uuid.uuid4())
+
+
+def sequential_ids(start: int = 1) -> Callable[[], str]:
+    """
+    Build an approval ID factory backed by a counter instead of the OS RNG.
+
+    IDs keep the 36-char UUID shape with the counter in the leading 8 hex
+    digits, so the 8-char IDs shown to users stay distinct. The process ID
+    fills the last group to keep IDs from separate processes apart.
+
+    Args:
+        start: First counter value (default: 1)
+
+    Returns:
+        Callable suitable for ApprovalManager(id_factory=...)
+    """
+    counter = itertools.count(start)
+    suffix = f"-0000-0000-0000-{os.getpid():012x}"
+    return lambda: f"{next(counter):08x}{suffix}"
+
+
+@dataclass(slots=True, frozen=True)
+class ToolCallRecord:
+    """Compact copy of the tool call an approval request is about."""
+    tool: Optional[str]
+    target: Optional[str] = None
+    command: Optional[str] = None
+
+    @classmethod
+    def from_mapping(cls, tool_call: Mapping[str, Any]) -> "ToolCallRecord":
+        """Build a record from a {"tool", "target", "command"} mapping."""
+        return cls(
+            tool=tool_call.get("tool"),
+            target=tool_call.get("target"),
+            command=tool_call.get("command"),
+        )
+
+
+@dataclass(slots=True)
 class ApprovalRequest:
     """Approval request with state tracking"""
     id: str
-    tool_call: Dict[str, Any]
+    tool_call: ToolCallRecord
     reason: str
     state: ApprovalState
     timestamp: datetime
@@ -37,23 +81,43 @@ class ApprovalManager:
 
     # 10 minute timeout for pending approvals
     TIMEOUT_MINUTES = 10
+    TIMEOUT = timedelta(minutes=TIMEOUT_MINUTES)
 
-    def __init__(self):
-        """Initialize approval manager with empty request tracking"""
-        self._requests: Dict[str, ApprovalRequest] = {}
+    def __init__(self, id_factory: Optional[Callable[[], str]] = None):
+        """
+        Initialize approval manager with empty request tracking.
 
-    def request(self, tool_call: Dict[str, Any], reason: str) -> ApprovalRequest:
+        Args:
+            id_factory: Callable returning a new approval ID
+                (default: random UUID4 string)
+        """
+        self._id_factory = id_factory or _uuid4_str
+        self._requests: Dict[str, ApprovalRequest] = {}
+        # Index of PENDING requests so pending scans don't walk the full history
+        self._pending: Dict[str, ApprovalRequest] = {}
+        # Events for waiters on PENDING requests, set when the request settles
+        self._settled: Dict[str, asyncio.Event] = {}
+
+    def request(
+        self,
+        tool_call: Union[ToolCallRecord, Mapping[str, Any]],
+        reason: str
+    ) -> ApprovalRequest:
         """
         Create new approval request.
 
         Args:
-            tool_call: Tool call requiring approval
+            tool_call: Tool call requiring approval (mappings are
+                normalized to a ToolCallRecord)
             reason: Human-readable reason for approval request
 
         Returns:
             ApprovalRequest in PENDING state
         """
-        approval_id = str(uuid.uuid4())
+        if not isinstance(tool_call, ToolCallRecord):
+            tool_call = ToolCallRecord.from_mapping(tool_call)
+
+        approval_id = self._id_factory()
         timestamp = datetime.now(UTC)
 
         request = ApprovalRequest(
@@ -65,6 +129,7 @@ class ApprovalManager:
         )
 
         self._requests[approval_id] = request
+        self._pending[approval_id] = request
         return request
 
     def approve(self, approval_id: str) -> None:
@@ -80,11 +145,15 @@ class ApprovalManager:
         Raises:
             KeyError: If approval_id does not exist
         """
-        request = self._requests[approval_id]  # Raises KeyError if not found
+        # Only PENDING requests transition; one pop on the happy path
+        request = self._pending.pop(approval_id, None)
+        if request is None:
+            # Already settled (idempotent for APPROVED, terminal states kept)
+            self._requests[approval_id]  # Raises KeyError if not found
+            return
 
-        # Only transition if currently PENDING (idempotent for APPROVED)
-        if request.state == ApprovalState.PENDING or request.state == ApprovalState.APPROVED:
-            request.state = ApprovalState.APPROVED
+        request.state = ApprovalState.APPROVED
+        self._notify_settled(approval_id)
 
     def reject(self, approval_id: str) -> None:
         """
@@ -98,26 +167,67 @@ class ApprovalManager:
         Raises:
             KeyError: If approval_id does not exist
         """
-        request = self._requests[approval_id]  # Raises KeyError if not found
+        # Only PENDING requests transition; one pop on the happy path
+        request = self._pending.pop(approval_id, None)
+        if request is None:
+            # Already settled (preserve terminal states)
+            self._requests[approval_id]  # Raises KeyError if not found
+            return
 
-        # Only transition if currently PENDING (preserve terminal states)
-        if request.state == ApprovalState.PENDING:
-            request.state = ApprovalState.REJECTED
+        request.state = ApprovalState.REJECTED
+        self._notify_settled(approval_id)
 
     def check_timeouts(self) -> None:
         """
         Check for and timeout old pending requests.
 
-        Scans all pending requests and marks those older than
-        TIMEOUT_MINUTES as TIMEOUT state.
+        Scans the pending index and marks requests older than
+        TIMEOUT_MINUTES as TIMEOUT state. Timestamps are mutable, so
+        expiry is read from each request rather than a creation-time queue.
         """
-        now = datetime.now(UTC)
-        timeout_threshold = now - timedelta(minutes=self.TIMEOUT_MINUTES)
+        # Periodic ticks with nothing pending skip the clock read entirely
+        if not self._pending:
+            return
 
-        for request in self._requests.values():
-            if request.state == ApprovalState.PENDING:
-                if request.timestamp < timeout_threshold:
-                    request.state = ApprovalState.TIMEOUT
+        timeout_threshold = datetime.now(UTC) - self.TIMEOUT
+
+        # Collect only the expired IDs; no snapshot of the whole index
+        expired = [
+            approval_id
+            for approval_id, request in self._pending.items()
+            if request.timestamp < timeout_threshold
+        ]
+        for approval_id in expired:
+            self._pending.pop(approval_id).state = ApprovalState.TIMEOUT
+            self._notify_settled(approval_id)
+
+    def settled(self, approval_id: str) -> asyncio.Event:
+        """
+        Get an event that is set once the request leaves PENDING.
+
+        Args:
+            approval_id: ID of request to watch
+
+        Returns:
+            asyncio.Event, already set if the request is not PENDING
+
+        Raises:
+            KeyError: If approval_id does not exist
+        """
+        request = self._requests[approval_id]  # Raises KeyError if not found
+
+        if request.state is not ApprovalState.PENDING:
+            event = asyncio.Event()
+            event.set()
+            return event
+
+        return self._settled.setdefault(approval_id, asyncio.Event())
+
+    def _notify_settled(self, approval_id: str) -> None:
+        """Wake anything waiting on approval_id via settled()."""
+        event = self._settled.pop(approval_id, None)
+        if event is not None:
+            event.set()
 
     def get(self, approval_id: str) -> Optional[ApprovalRequest]:
         """
@@ -138,10 +248,7 @@ class ApprovalManager:
         Returns:
             List of ApprovalRequest objects in PENDING state
         """
-        return [
-            request for request in self._requests.values()
-            if request.state == ApprovalState.PENDING
-        ]
+        return list(self._pending.values())
 
     def approve_all(self) -> int:
         """
@@ -150,9 +257,16 @@ class ApprovalManager:
         Returns:
             Count of approvals that were approved
         """
-        pending = self.list_pending()
+        # Swap in a fresh index rather than copying and clearing the old one
+        pending, self._pending = self._pending, {}
+
+        approved = ApprovalState.APPROVED
+        for request in pending.values():
+            request.state = approved
 
-        for request in pending:
-            self.approve(request.id)
+        # Only requests someone is waiting on have an event to set
+        if self._settled:
+            for approval_id in pending:
+                self._notify_settled(approval_id)
 
         return len(pending)
@@ -6,10 +6,11 @@ interface for approval workflow coordination.
 """
 
 import asyncio
+from functools import lru_cache
 from typing import Tuple, Optional, TYPE_CHECKING
 
 from src.approval.detector import OperationDetector, OperationType
-from src.approval.manager import ApprovalManager
+from src.approval.manager import ApprovalManager, ToolCallRecord
 from src.approval.models import ApprovalState
 from src.claude.parser import ToolCall
 
@@ -19,6 +20,13 @@ if TYPE_CHECKING:
     from src.emergency.mode import EmergencyMode
 
 
+# Bounded so distinct paths in a long-running daemon can't grow it unchecked
+@lru_cache(maxsize=2048)
+def _approval_header(tool: str, detail: str, reason: str) -> str:
+    """Request-independent part of an approval message (memoized)."""
+    return f"⚠️ Approval needed: {tool} on {detail}\n\nReason: {reason}\n\n"
+
+
 class ApprovalWorkflow:
     """
     Coordinate approval workflow for Claude operations.
@@ -67,17 +75,17 @@ class ApprovalWorkflow:
         operation_type, reason = self.detector.classify(tool_call)
 
         # Safe operations are auto-approved
-        if operation_type == OperationType.SAFE:
+        if operation_type is OperationType.SAFE:
             return (True, None)
 
         # Destructive operations require approval
         # Create approval request
-        tool_call_dict = {
-            "tool": tool_call.tool,
-            "target": tool_call.target,
-            "command": tool_call.command,
-        }
-        request = self.manager.request(tool_call_dict, reason)
+        record = ToolCallRecord(
+            tool=tool_call.tool,
+            target=tool_call.target,
+            command=tool_call.command,
+        )
+        request = self.manager.request(record, reason)
 
         return (False, request.id)
 
@@ -110,12 +118,12 @@ class ApprovalWorkflow:
         operation_type, reason = self.detector.classify(tool_call)
 
         # Create approval request
-        tool_call_dict = {
-            "tool": tool_call.tool,
-            "target": tool_call.target,
-            "command": tool_call.command,
-        }
-        request = self.manager.request(tool_call_dict, reason)
+        record = ToolCallRecord(
+            tool=tool_call.tool,
+            target=tool_call.target,
+            command=tool_call.command,
+        )
+        request = self.manager.request(record, reason)
 
         # Send notification
         if self.notification_manager:
@@ -136,9 +144,9 @@ class ApprovalWorkflow:
         """
         Wait for approval request to be approved or rejected.
 
-        Polls approval state every 1 second until:
+        Waits on the manager's settled event (no polling) until:
         - Request is approved (returns True)
-        - Request is rejected (returns False)
+        - Request is rejected or times out (returns False)
         - Timeout expires (returns False)
 
         Args:
@@ -148,29 +156,28 @@ class ApprovalWorkflow:
         Returns:
             True if approved, False if rejected or timeout
         """
-        elapsed = 0
-        poll_interval = 1  # Poll every 1 second
-
-        while elapsed < timeout:
-            # Get current state
-            request = self.manager.get(request_id)
-
-            if request is None:
-                # Request disappeared - treat as rejection
-                return False
-
-            # Check terminal states
-            if request.state == ApprovalState.APPROVED:
-                return True
-            elif request.state in (ApprovalState.REJECTED, ApprovalState.TIMEOUT):
-                return False
+        request = self.manager.get(request_id)
+        if request is None:
+            # Unknown request - treat as rejection
+            return False
+
+        # Already settled (e.g. approve all ran first): no event, no await
+        if request.state is not ApprovalState.PENDING:
+            return request.state is ApprovalState.APPROVED
+
+        try:
+            await asyncio.wait_for(
+                self.manager.settled(request_id).wait(), timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            # Timeout expired without approval
+            return False
 
-            # Wait before next poll
-            await asyncio.sleep(poll_interval)
-            elapsed += poll_interval
+        return request.state is ApprovalState.APPROVED
 
-        # Timeout expired without approval
-        return False
+    def clear_caches(self) -> None:
+        """Drop memoized approval message headers (e.g. on config reload)."""
+        _approval_header.cache_clear()
 
     def format_approval_message(
         self, tool_call: ToolCall, reason: str, request_id: str
@@ -189,12 +196,8 @@ class ApprovalWorkflow:
         # Determine what to display (target for file operations, command for bash)
         detail = tool_call.target if tool_call.target else tool_call.command
 
-        message_lines = [
-            f"⚠️ Approval needed: {tool_call.tool} on {detail}",
-            "",
-            f"Reason: {reason}",
-            "",
-            f"Reply 'approve {request_id}' or 'reject {request_id}'",
-        ]
-
-        return "\n".join(message_lines)
+        # Only the reply line depends on the request; the rest is cached
+        return (
+            _approval_header(tool_call.tool, detail, reason)
+            + f"Reply 'approve {request_id}' or 'reject {request_id}'"
+        )
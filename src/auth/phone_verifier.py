@@ -1,6 +1,9 @@
 """Phone number authentication for Signal bot."""
 
+import hmac
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -9,6 +12,59 @@ import structlog
 logger = structlog.get_logger(__name__)
 
 
+def _is_e164(phone_number: str) -> bool:
+    """Check that phone_number is E.164: '+', a non-zero digit, then up to 14 digits.
+
+    Hand-written instead of a regex: the grammar is tiny, and encoding to ASCII
+    rejects unicode digit lookalikes before the byte-level digit check.
+    """
+    # Cheapest rejections first: length and leading '+' need no encoding
+    if not (3 <= len(phone_number) <= 16 and phone_number[0] == "+"):
+        return False
+
+    try:
+        raw = phone_number.encode("ascii", "strict")
+    except UnicodeEncodeError:
+        return False
+
+    if not 0x31 <= raw[1] <= 0x39:
+        return False
+
+    # bytes.isdigit() only accepts ASCII 0-9
+    return raw[2:].isdigit()
+
+
+@lru_cache(maxsize=8)
+def _read_authorized_number(config_path: str, mtime_ns: int, size: int) -> str:
+    """Parse authorized_number from daemon.json.
+
+    mtime_ns and size only key the cache, so an edited file is re-read.
+    Failures raise and are not cached.
+    """
+    try:
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        logger.error("config_file_not_found", config_path=config_path)
+        raise
+    except json.JSONDecodeError as e:
+        logger.error("config_invalid_json", config_path=config_path, error=str(e))
+        raise ValueError(f"Invalid JSON in config file: {e}")
+
+    if 'authorized_number' not in config:
+        raise ValueError("Config missing 'authorized_number' field")
+
+    authorized = config['authorized_number']
+    if isinstance(authorized, str):
+        # Normalized once here so verify() stays a single compare
+        authorized = authorized.strip()
+    if not isinstance(authorized, str) or not authorized:
+        raise ValueError("'authorized_number' must be a non-empty string")
+
+    logger.debug("authorized_number_loaded", config_path=config_path)
+    return authorized
+
+
 class PhoneVerifier:
     """Verifies incoming messages against authorized phone number.
 
@@ -16,12 +72,23 @@ class PhoneVerifier:
     All other messages are logged and rejected.
     """
 
-    def __init__(self, config_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        authorized_phone: Optional[str] = None,
+    ) -> None:
         """Initialize phone verifier.
 
         Args:
             config_path: Path to daemon.json config file (default: config/daemon.json)
+            authorized_phone: Authorized number in E.164 format. When given,
+                the config file is not read.
         """
+        if authorized_phone is not None:
+            self.config_path = config_path
+            self.authorized_number = authorized_phone
+            return
+
         if config_path is None:
             # Default to config/daemon.json relative to project root
             project_root = Path(__file__).parent.parent.parent
@@ -30,9 +97,23 @@ class PhoneVerifier:
         self.config_path = config_path
         self.authorized_number = self._load_authorized_number()
 
+    @property
+    def authorized_number(self) -> str:
+        """Authorized phone number in E.164 format."""
+        return self._authorized_number
+
+    @authorized_number.setter
+    def authorized_number(self, value: str) -> None:
+        self._authorized_number = value
+        # Encoded once so verify() compares bytes without re-encoding
+        self._authorized = value.encode("utf-8")
+
     def _load_authorized_number(self) -> str:
         """Load authorized phone number from config file.
 
+        The parse is cached per file version (real path, mtime, size), so
+        verifiers built from an unchanged config share one read.
+
         Returns:
             str: Authorized phone number in E.164 format
 
@@ -41,25 +122,14 @@ class PhoneVerifier:
             ValueError: If config is invalid or missing authorized_number
         """
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
-
-            if 'authorized_number' not in config:
-                raise ValueError("Config missing 'authorized_number' field")
-
-            authorized = config['authorized_number']
-            if not isinstance(authorized, str) or not authorized:
-                raise ValueError("'authorized_number' must be a non-empty string")
-
-            logger.debug("authorized_number_loaded", config_path=self.config_path)
-            return authorized
-
+            stat = os.stat(self.config_path)
         except FileNotFoundError:
             logger.error("config_file_not_found", config_path=self.config_path)
             raise
-        except json.JSONDecodeError as e:
-            logger.error("config_invalid_json", config_path=self.config_path, error=str(e))
-            raise ValueError(f"Invalid JSON in config file: {e}")
+
+        return _read_authorized_number(
+            os.path.realpath(self.config_path), stat.st_mtime_ns, stat.st_size
+        )
 
     def verify(self, phone_number: str) -> bool:
         """Verify if phone number is authorized.
@@ -70,11 +140,17 @@ class PhoneVerifier:
         Returns:
             bool: True if phone number matches authorized_number, False otherwise
         """
-        if not phone_number:
+        if not phone_number or not isinstance(phone_number, str):
             logger.warning("auth_failed_empty_number", phone_number=phone_number)
             return False
 
-        is_authorized = phone_number == self.authorized_number
+        if not _is_e164(phone_number):
+            logger.warning("auth_failed_invalid_format", phone_number=phone_number)
+            return False
+
+        # Constant-time compare; candidate is known ASCII after _is_e164()
+        authorized = self._authorized
+        is_authorized = hmac.compare_digest(phone_number.encode("ascii"), authorized)
 
         if is_authorized:
             logger.info("auth_success", phone_number=phone_number)
@@ -8,7 +8,7 @@ Provides stdin/stdout interface for:
 """
 
 import asyncio
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Iterable
 
 
 class CLIBridge:
@@ -21,6 +21,9 @@ class CLIBridge:
     - Connection status monitoring
     """
 
+    # Bytes requested from stdout per read; one read can carry many lines
+    READ_CHUNK_SIZE = 64 * 1024
+
     def __init__(self, process: asyncio.subprocess.Process):
         """
         Initialize CLIBridge with subprocess.
@@ -29,6 +32,10 @@ class CLIBridge:
             process: Running Claude Code CLI subprocess with stdin/stdout pipes
         """
         self._process = process
+        # stdout bytes read but not yet yielded (kept if a reader stops early)
+        self._buf = bytearray()
+        # Set once the process is seen exited; a process never restarts
+        self._dead = False
 
     async def send_command(self, command: str) -> None:
         """
@@ -40,14 +47,32 @@ class CLIBridge:
         Args:
             command: Command text to send (newline will be added)
 
+        Raises:
+            ValueError: If stdin is not available
+        """
+        await self.send_commands((command,))
+
+    async def send_commands(self, commands: Iterable[str]) -> None:
+        """
+        Send several commands to Claude Code CLI in one stdin write.
+
+        Each command is UTF-8 encoded with a newline terminator; the batch
+        goes out as a single write followed by a single drain, instead of
+        one write and drain per command.
+
+        Args:
+            commands: Command texts to send, in order (newlines will be added)
+
         Raises:
             ValueError: If stdin is not available
         """
         if self._process.stdin is None:
             raise ValueError("Process stdin is not available")
 
-        # Encode command with newline as UTF-8 bytes
-        data = f"{command}\n".encode('utf-8')
+        # Encode commands with newlines as UTF-8 bytes
+        data = "".join(f"{command}\n" for command in commands).encode('utf-8')
+        if not data:
+            return
 
         # Write to stdin
         self._process.stdin.write(data)
@@ -59,8 +84,12 @@ class CLIBridge:
         """
         Read response lines from Claude Code CLI stdout.
 
-        Yields lines until empty line or EOF is encountered.
-        Each line is UTF-8 decoded with newline stripped.
+        Yields lines until EOF is encountered. Each line is UTF-8 decoded
+        with newline stripped.
+
+        stdout is read in chunks of up to READ_CHUNK_SIZE bytes and split
+        into lines, so a burst of output costs one await rather than one
+        per line.
 
         Yields:
             Response lines as strings
@@ -71,26 +100,42 @@ class CLIBridge:
         if self._process.stdout is None:
             raise ValueError("Process stdout is not available")
 
-        while True:
-            # Read one line from stdout
-            line_bytes = await self._process.stdout.readline()
+        buf = self._buf
 
-            # Empty bytes means EOF or end of output
-            if not line_bytes:
+        while True:
+            # Yield complete lines already buffered; splitting bytes (not
+            # str) keeps multi-byte characters cut across reads intact
+            while (end := buf.find(b"\n")) != -1:
+                line = buf[:end].decode('utf-8')
+                del buf[:end + 1]
+                yield line
+
+            chunk = await self._process.stdout.read(self.READ_CHUNK_SIZE)
+
+            # Empty bytes means EOF; flush any unterminated last line
+            if not chunk:
+                if buf:
+                    line = buf.decode('utf-8')
+                    buf.clear()
+                    yield line
                 break
 
-            # Decode UTF-8 and strip newline
-            line = line_bytes.decode('utf-8').rstrip('\n')
-
-            # Yield the line
-            yield line
+            buf += chunk
 
     @property
     def is_connected(self) -> bool:
         """
         Check if bridge is connected to running process.
 
+        Once the process has been seen to exit, later checks return False
+        without probing it again.
+
         Returns:
             True if process is still running (returncode is None)
         """
-        return self._process.returncode is None
+        if self._dead:
+            return False
+        if self._process.returncode is not None:
+            self._dead = True
+            return False
+        return True
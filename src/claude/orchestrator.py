@@ -109,12 +109,14 @@ class ClaudeOrchestrator:
                     approved, request_id = self.approval_workflow.intercept(parsed)
 
                     if not approved:
-                        # Operation requires approval - notify user
+                        # Operation requires approval - notify user, sending
+                        # buffered output ahead of the prompt in the same message
                         _, reason = self.approval_workflow.detector.classify(parsed)
                         approval_msg = self.approval_workflow.format_approval_message(
                             parsed, reason, request_id
                         )
-                        await self._send_message(approval_msg)
+                        batcher.add(approval_msg)
+                        await self._flush_batch(batcher)
 
                         # Wait for user approval
                         is_approved = await self.approval_workflow.wait_for_approval(
@@ -123,13 +125,13 @@ class ClaudeOrchestrator:
 
                         if not is_approved:
                             # Rejected or timed out - skip operation
-                            rejection_msg = f"❌ Operation rejected or timed out - skipping {parsed.tool}"
-                            await self._send_message(rejection_msg)
+                            batcher.add(f"❌ Operation rejected or timed out - skipping {parsed.tool}")
+                            await self._flush_batch(batcher)
                             continue
 
                         # Approved - notify and proceed
-                        approval_msg = f"✅ Operation approved - executing {parsed.tool}"
-                        await self._send_message(approval_msg)
+                        batcher.add(f"✅ Operation approved - executing {parsed.tool}")
+                        await self._flush_batch(batcher)
 
                 # Format for Signal display
                 formatted = self.responder.format(parsed)
@@ -207,10 +209,12 @@ class ClaudeOrchestrator:
         """
         Send a message to Signal for current session.
 
+        Empty messages are skipped.
+
         Args:
             message: Message text to send
         """
-        if self.current_thread_id:
+        if message and self.current_thread_id:
             # send_signal expects (recipient, message)
             # Use thread_id (phone number) for routing, not session_id (UUID)
             await self.send_signal(self.current_thread_id, message)
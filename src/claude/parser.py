@@ -1,7 +1,7 @@
 """Parse Claude Code CLI output into structured events."""
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import Generator, Optional
 
@@ -15,27 +15,30 @@ class OutputType(Enum):
     RESPONSE = auto()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ParsedOutput:
     """Base class for parsed output."""
     
     type: OutputType
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolCall(ParsedOutput):
     """A tool call made by Claude."""
     
     tool: str
     target: Optional[str] = None
     command: Optional[str] = None
+    # Lowercased tool name, computed once for case-insensitive lookups
+    _tool_lc: str = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
-        """Set type to TOOL_CALL."""
-        self.type = OutputType.TOOL_CALL
+        """Set type to TOOL_CALL and cache the lowercased tool name."""
+        object.__setattr__(self, "type", OutputType.TOOL_CALL)
+        object.__setattr__(self, "_tool_lc", self.tool.lower() if self.tool else "")
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Progress(ParsedOutput):
     """A progress/status message."""
     
@@ -43,10 +46,10 @@ class Progress(ParsedOutput):
     
     def __post_init__(self):
         """Set type to PROGRESS."""
-        self.type = OutputType.PROGRESS
+        object.__setattr__(self, "type", OutputType.PROGRESS)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Error(ParsedOutput):
     """An error message."""
     
@@ -54,10 +57,10 @@ class Error(ParsedOutput):
     
     def __post_init__(self):
         """Set type to ERROR."""
-        self.type = OutputType.ERROR
+        object.__setattr__(self, "type", OutputType.ERROR)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Response(ParsedOutput):
     """A regular response text."""
     
@@ -65,7 +68,7 @@ class Response(ParsedOutput):
     
     def __post_init__(self):
         """Set type to RESPONSE."""
-        self.type = OutputType.RESPONSE
+        object.__setattr__(self, "type", OutputType.RESPONSE)
 
 
 class OutputParser:
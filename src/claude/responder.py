@@ -2,7 +2,7 @@
 
 import re
 import time
-from typing import List
+from typing import List, Optional
 
 from .parser import ParsedOutput, ToolCall, Progress, Error, Response
 from .code_formatter import CodeFormatter, LengthDetector
@@ -29,12 +29,17 @@ class SignalResponder:
     PROGRESS_EMOJI = "⏳"
     ERROR_EMOJI = "❌"
 
-    def __init__(self, signal_api_url: str = "http://localhost:8080"):
+    def __init__(
+        self,
+        signal_api_url: str = "http://localhost:8080",
+        sender_number: Optional[str] = None
+    ):
         """
         Initialize SignalResponder with code display components.
 
         Args:
             signal_api_url: Signal API URL for attachments
+            sender_number: Bot's registered Signal number to send attachments from
         """
         # Code display components
         self.code_formatter = CodeFormatter()
@@ -43,7 +48,9 @@ class SignalResponder:
         self.diff_parser = DiffParser()
         self.diff_renderer = DiffRenderer()
         self.summary_generator = SummaryGenerator()
-        self.attachment_handler = AttachmentHandler(signal_api_url)
+        self.attachment_handler = AttachmentHandler(
+            signal_api_url, sender_number=sender_number
+        )
         self.signal_api_url = signal_api_url
 
     def format(self, parsed: ParsedOutput) -> str:
@@ -274,10 +281,13 @@ class MessageBatcher:
         """
         Add a message to the buffer.
 
+        Empty messages are dropped so they never cost a Signal send.
+
         Args:
             message: Message to buffer
         """
-        self._buffer.append(message)
+        if message:
+            self._buffer.append(message)
 
     def should_flush(self) -> bool:
         """
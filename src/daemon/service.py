@@ -110,7 +110,10 @@ class ServiceDaemon:
 
         # Claude integration components
         self.output_parser = OutputParser()
-        self.signal_responder = SignalResponder()
+        self.signal_responder = SignalResponder(
+            signal_api_url=signal_api_url,
+            sender_number=signal_phone_number
+        )
         self.claude_orchestrator = ClaudeOrchestrator(
             bridge=None,  # Bridge set when session starts
             parser=self.output_parser,
@@ -440,6 +443,9 @@ class ServiceDaemon:
             # Disconnect from Signal API
             await self.signal_client.disconnect()
 
+            # Close the shared attachment upload session
+            await self.signal_responder.attachment_handler.aclose()
+
             # Stop health check endpoint
             await self._stop_health_server()
 
@@ -43,4 +43,4 @@ class EmergencyAutoApprover:
         tool_call = ToolCall(tool_name)
         operation_type, _ = self.detector.classify(tool_call)
 
-        return operation_type == OperationType.SAFE
+        return operation_type is OperationType.SAFE
@@ -283,7 +283,10 @@ class SessionCommands:
             return f"Error: Project path does not exist: {resolved_path}"
 
         # Create session
-        session = await self.manager.create(resolved_path, thread_id)
+        try:
+            session = await self.manager.create(resolved_path, thread_id)
+        except ValueError as e:
+            return f"Error: {e}"
 
         # Transition CREATED -> ACTIVE
         session = await self.lifecycle.transition(
@@ -17,6 +17,34 @@ from uuid import uuid4
 
 logger = structlog.get_logger(__name__)
 
+# Characters no usable project path contains: NUL can't be passed to the OS,
+# and line breaks would split the path across log lines and Signal messages.
+# Checked with frozenset.isdisjoint, a single C-level pass over the path.
+_FORBIDDEN_PATH_CHARS = frozenset("\n\r\x00")
+
+
+def _has_forbidden_chars(path: str) -> bool:
+    """Return True if path contains NUL or a line break."""
+    return not _FORBIDDEN_PATH_CHARS.isdisjoint(path)
+
+
+# Fixed statement text lives here, out of the method bodies that use it
+_SQL_INSERT_SESSION = """
+    INSERT INTO sessions (id, project_path, thread_id, status, context, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_SQL_GET_SESSION = """
+    SELECT id, project_path, thread_id, status, context, created_at, updated_at
+    FROM sessions
+    WHERE id = ?
+"""
+_SQL_LIST_SESSIONS = """
+    SELECT id, project_path, thread_id, status, context, created_at, updated_at
+    FROM sessions
+    ORDER BY created_at DESC
+"""
+_SQL_UPDATE_CONTEXT = "UPDATE sessions SET context = ? WHERE id = ?"
+
 
 class SessionNotFoundError(Exception):
     """Raised when a session is not found."""
@@ -77,7 +105,11 @@ class SessionManager:
         Creates database directory if needed.
         Enables WAL mode for concurrent access.
         Creates tables and indexes if not exist.
+        Idempotent: calling again on an open manager is a no-op.
         """
+        if self._connection is not None:
+            return
+
         # Create directory if needed
         db_dir = Path(self.db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
@@ -110,7 +142,13 @@ class SessionManager:
 
         Returns:
             Session with generated UUID, CREATED status, timestamps
+
+        Raises:
+            ValueError: If project_path contains NUL or a line break
         """
+        if _has_forbidden_chars(project_path):
+            raise ValueError(f"Invalid project path: {project_path!r}")
+
         session_id = str(uuid4())
         now = datetime.now(UTC)
         status = SessionStatus.CREATED
@@ -118,10 +156,7 @@ class SessionManager:
 
         async with self._lock:
             await self._connection.execute(
-                """
-                INSERT INTO sessions (id, project_path, thread_id, status, context, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
+                _SQL_INSERT_SESSION,
                 (
                     session_id,
                     project_path,
@@ -156,11 +191,7 @@ class SessionManager:
         """
         async with self._lock:
             cursor = await self._connection.execute(
-                """
-                SELECT id, project_path, thread_id, status, context, created_at, updated_at
-                FROM sessions
-                WHERE id = ?
-                """,
+                _SQL_GET_SESSION,
                 (session_id,)
             )
             row = await cursor.fetchone()
@@ -178,13 +209,7 @@ class SessionManager:
             List of sessions, newest first
         """
         async with self._lock:
-            cursor = await self._connection.execute(
-                """
-                SELECT id, project_path, thread_id, status, context, created_at, updated_at
-                FROM sessions
-                ORDER BY created_at DESC
-                """
-            )
+            cursor = await self._connection.execute(_SQL_LIST_SESSIONS)
             rows = await cursor.fetchall()
 
         return [self._row_to_session(row) for row in rows]
@@ -268,7 +293,7 @@ class SessionManager:
 
         async with self._lock:
             await self._connection.execute(
-                "UPDATE sessions SET context = ? WHERE id = ?",
+                _SQL_UPDATE_CONTEXT,
                 (json.dumps(updated_context), session_id)
             )
             await self._connection.commit()
@@ -1,16 +1,111 @@
 """Signal attachment handling for code file uploads."""
 
+import asyncio
+import binascii
+import gzip
+import json
+import mimetypes
 import os
-import re
-import tempfile
-from pathlib import Path
-from typing import Optional
+from functools import lru_cache
+from typing import AsyncIterator, BinaryIO, Iterator, List, Optional, Tuple, Union
 
 import aiohttp
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Characters invalid in filenames on some platforms, the data URI
+# separators ";" and ",", and ASCII control characters, mapped to "_"
+_FILENAME_TRANSLATION = str.maketrans(
+    dict.fromkeys('<>:"/\\|?*;,' + "".join(map(chr, range(32))), "_")
+)
+
+# Longest display filename sent (NAME_MAX on most filesystems)
+_MAX_FILENAME_CHARS = 255
+
+
+def _is_e164(phone: str) -> bool:
+    """Check E.164: '+', a non-zero digit, then 1-14 more digits.
+
+    Plain str checks instead of a regex: the length and '+' tests reject
+    most bad input before any scan, and isascii() keeps isdigit() from
+    accepting non-ASCII digits.
+    """
+    return (
+        3 <= len(phone) <= 16
+        and phone[0] == "+"
+        and "1" <= phone[1] <= "9"
+        and phone.isascii()
+        and phone[2:].isdigit()
+    )
+
+
+@lru_cache(maxsize=256)
+def _sanitize_filename(filename: str) -> str:
+    """Cached body of AttachmentHandler._sanitize_filename.
+
+    The same few names (session logs, repeated edits) recur across sends.
+    """
+    # Get basename (removes any directory path)
+    safe = os.path.basename(filename)
+    # Remove/replace invalid chars for cross-platform safety
+    safe = safe.translate(_FILENAME_TRANSLATION)
+    # Fit common filesystem name limits, keeping the extension (it
+    # picks the MIME type)
+    if len(safe) > _MAX_FILENAME_CHARS:
+        root, ext = os.path.splitext(safe)
+        ext = ext[:16]
+        safe = root[:_MAX_FILENAME_CHARS - len(ext)] + ext
+    # Ensure not empty
+    return safe if safe else "code.txt"
+
+
+@lru_cache(maxsize=256)
+def _data_uri_prefix(display_name: str) -> bytes:
+    """Opening quote and "data:<mime>;filename=...;base64," for an attachment.
+
+    Cached: guess_type plus JSON escaping cost more than the lookup.
+    """
+    mime, encoding = mimetypes.guess_type(display_name)
+    if encoding == "gzip":
+        mime = "application/gzip"
+    mime = mime or "text/plain"
+    data_uri = f"data:{mime};filename={display_name};base64,"
+    return json.dumps(data_uri)[:-1].encode("utf-8")
+
+
+def _b64_chunks(source: Union[bytes, BinaryIO], blocksize: int) -> Iterator[bytes]:
+    """Base64-encode bytes or an open file's content blocksize bytes at a time.
+
+    Yields encoded bytes straight from binascii (no str round-trip). With
+    blocksize a multiple of 3 the chunks concatenate to valid base64.
+    """
+    if isinstance(source, bytes):
+        view = memoryview(source)
+        for start in range(0, len(view), blocksize):
+            yield binascii.b2a_base64(view[start:start + blocksize], newline=False)
+    else:
+        while chunk := source.read(blocksize):
+            yield binascii.b2a_base64(chunk, newline=False)
+
+
+def _maybe_gzip(data: bytes, min_bytes: int) -> Tuple[bytes, bool]:
+    """Gzip data if it's at least min_bytes and shrinks by 10% or more.
+
+    Level 1: on redundant source code the higher levels barely improve
+    the ratio but cost several times the CPU.
+
+    Returns:
+        (payload, compressed) tuple
+    """
+    if len(data) < min_bytes:
+        return data, False
+    # mtime=0 keeps the output deterministic for identical input
+    compressed = gzip.compress(data, compresslevel=1, mtime=0)
+    if len(compressed) > len(data) * 0.9:
+        return data, False
+    return compressed, True
+
 
 class AttachmentHandler:
     """Handle Signal file attachments for code display."""
@@ -18,36 +113,306 @@ class AttachmentHandler:
     MAX_SIZE_BYTES = 100 * 1024 * 1024  # 100MB Signal limit
     LARGE_FILE_THRESHOLD = 10 * 1024 * 1024  # 10MB warning threshold
 
-    def __init__(self, signal_api_url: str):
+    # Shared upload session: pooled keep-alive connections to the REST API
+    CONNECTOR_LIMIT = 100
+    CONNECTOR_LIMIT_PER_HOST = 10
+    # Idle seconds before a pooled connection is dropped; aiohttp's 15s
+    # default reconnects between most bursts of uploads
+    KEEPALIVE_TIMEOUT = 60
+    # Seconds a resolved REST API host is cached (aiohttp default: 10)
+    DNS_CACHE_TTL = 300
+    UPLOAD_TIMEOUT = aiohttp.ClientTimeout(total=300, connect=10)
+
+    # Raw bytes base64-encoded per body chunk; a multiple of 3 so the
+    # encoded chunks concatenate without padding in between
+    B64_CHUNK_BYTES = 57 * 1024
+
+    # Code at least this long is UTF-8 encoded in a worker thread so the
+    # event loop keeps serving other uploads meanwhile
+    ENCODE_IN_THREAD_CHARS = 1024 * 1024
+
+    # Below this, gzip's header and CPU cost outweigh the bytes saved
+    COMPRESS_MIN_BYTES = 1024
+
+    # Attempts per upload when the REST API can't be reached, with the
+    # delay doubling from UPLOAD_RETRY_DELAY seconds between them
+    UPLOAD_ATTEMPTS = 3
+    UPLOAD_RETRY_DELAY = 1.0
+
+    _JSON_HEADERS = {"Content-Type": "application/json"}
+
+    # /v2/send JSON body up to the opening of the attachment list
+    _SEND_BODY_HEAD = (
+        '{{{sender}"recipients": [{recipient}], "message": {message}, '
+        '"base64_attachments": ['
+    )
+
+    def __init__(
+        self,
+        signal_api_url: str,
+        max_concurrent_uploads: int = 4,
+        sender_number: Optional[str] = None
+    ):
         """Initialize attachment handler.
 
         Args:
             signal_api_url: Base URL for signal-cli-rest-api
+            max_concurrent_uploads: Uploads allowed in flight at once across
+                all callers of this handler (default: 4)
+            sender_number: Bot's registered Signal number, sent as the
+                /v2/send "number" field
         """
         self.signal_api_url = signal_api_url
+        self._log = logger.bind(signal_api_url=signal_api_url)
+        # Fixed per handler, so rendered into the body head once here
+        self._sender_field = (
+            f'"number": {json.dumps(sender_number)}, ' if sender_number else ""
+        )
+        # Built once; tolerate a configured base URL ending in "/"
+        self._send_url = f"{signal_api_url.rstrip('/')}/v2/send"
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Admission control so a burst of sends can't swamp the REST API
+        self._upload_semaphore = asyncio.Semaphore(max_concurrent_uploads)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared upload session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.CONNECTOR_LIMIT,
+                    limit_per_host=self.CONNECTOR_LIMIT_PER_HOST,
+                    keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+                    ttl_dns_cache=self.DNS_CACHE_TTL,
+                ),
+                timeout=self.UPLOAD_TIMEOUT,
+            )
+        return self._session
+
+    async def aclose(self) -> None:
+        """Close the shared upload session (call on shutdown)."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     async def send_code_file(
         self,
         recipient: str,
         code: str,
         filename: str,
-        language: str = None
+        language: str = None,
+        compress: bool = False
     ) -> Optional[str]:
         """Send code as Signal attachment.
 
+        The code is uploaded straight from memory; no temp file is written.
+
         Args:
             recipient: Phone number to send to (E.164 format)
             code: Code content
             filename: Display filename (e.g., "user.py")
             language: Optional language for syntax detection
+            compress: Gzip the code and send it as "<filename>.gz" when
+                that makes it at least 10% smaller (default: False)
+
+        Returns:
+            Attachment ID from Signal API (timestamp), or None if upload failed
+        """
+        if self._too_many_chars(code, recipient, filename):
+            return None
+
+        content = await self._encode_code(code)
+
+        compressed = False
+        if compress:
+            content, compressed = await self._compress(content)
+
+        safe_filename = self._check_upload(len(content), recipient, filename)
+        if safe_filename is None:
+            return None
+        if compressed:
+            # Re-sanitize so the name plus suffix still fits the length cap
+            safe_filename = self._sanitize_filename(safe_filename + ".gz")
+
+        # Upload to Signal via REST API
+        return await self._upload_attachment(content, recipient, safe_filename)
+
+    async def send_code_files(
+        self,
+        recipient: str,
+        items: List[Tuple[str, str]]
+    ) -> Optional[str]:
+        """Send several code files as attachments of one Signal message.
+
+        All files go out in a single /v2/send request instead of one
+        request per file.
+
+        Args:
+            recipient: Phone number to send to (E.164 format)
+            items: (code, filename) pairs
+
+        Returns:
+            Timestamp from Signal API, or None if any file was rejected,
+            the files together exceed MAX_SIZE_BYTES, or the upload failed
+        """
+        if not items:
+            return None
+
+        attachments = []
+        total_bytes = 0
+        for code, filename in items:
+            if self._too_many_chars(code, recipient, filename):
+                return None
+            content = await self._encode_code(code)
+            safe_filename = self._check_upload(len(content), recipient, filename)
+            if safe_filename is None:
+                return None
+            # All files share one message, so the limit applies to their sum
+            total_bytes += len(content)
+            if total_bytes > self.MAX_SIZE_BYTES:
+                self._log.error(
+                    "file_too_large",
+                    size_bytes=total_bytes,
+                    max_bytes=self.MAX_SIZE_BYTES,
+                    filename=filename
+                )
+                return None
+            attachments.append((content, safe_filename))
+
+        return await self._upload_attachments(attachments, recipient)
+
+    async def send_code_files_parallel(
+        self,
+        recipient: str,
+        items: List[Tuple[str, str]],
+        concurrency: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """Send code files as separate messages, several uploads at a time.
+
+        Unlike send_code_files, each file is its own Signal message. All
+        uploads are started together and share the pooled session, so the
+        batch takes about as long as its slowest upload per
+        max_concurrent_uploads-wide wave, not the sum of all of them.
+
+        Args:
+            recipient: Phone number to send to (E.164 format)
+            items: (code, filename) pairs
+            concurrency: Optional tighter cap on this batch's simultaneous
+                uploads (default: only the handler-wide
+                max_concurrent_uploads applies)
+
+        Returns:
+            Attachment ID (or None on failure) per item, in input order
+        """
+        semaphore = asyncio.Semaphore(concurrency) if concurrency is not None else None
+
+        async def send_one(code: str, filename: str) -> Optional[str]:
+            if semaphore is None:
+                return await self.send_code_file(recipient, code, filename)
+            async with semaphore:
+                return await self.send_code_file(recipient, code, filename)
+
+        # send_code_file logs and returns None on failure, so one bad
+        # upload doesn't cancel the rest
+        return await asyncio.gather(
+            *(send_one(code, filename) for code, filename in items)
+        )
+
+    async def send_file(
+        self,
+        recipient: str,
+        file_path: str,
+        filename: Optional[str] = None
+    ) -> Optional[str]:
+        """Send an existing file as Signal attachment, streamed from disk.
+
+        Args:
+            recipient: Phone number to send to (E.164 format)
+            file_path: Path of the file to send
+            filename: Display filename (default: basename of file_path)
 
         Returns:
             Attachment ID from Signal API (timestamp), or None if upload failed
         """
+        display_name = filename if filename is not None else os.path.basename(file_path)
+
+        # Open once and size the same handle, so the bytes checked are the
+        # bytes sent even if the path is replaced meanwhile
+        try:
+            f = open(file_path, "rb")
+        except OSError as e:
+            self._log.error(
+                "attachment_file_unreadable",
+                path=file_path,
+                error=str(e)
+            )
+            return None
+
+        with f:
+            size_bytes = os.fstat(f.fileno()).st_size
+
+            safe_filename = self._check_upload(size_bytes, recipient, display_name)
+            if safe_filename is None:
+                return None
+
+            return await self._upload_attachment(f, recipient, safe_filename)
+
+    def _too_many_chars(self, code: str, recipient: str, filename: str) -> bool:
+        """Reject code that can't fit before allocating its UTF-8 encoding.
+
+        Every character encodes to at least one byte, so more characters
+        than MAX_SIZE_BYTES is oversized whatever the encoded length.
+        """
+        if len(code) <= self.MAX_SIZE_BYTES:
+            return False
+        # Logs file_too_large (with the character count as a lower bound)
+        self._check_upload(len(code), recipient, filename)
+        return True
+
+    async def _encode_code(self, code: str) -> bytes:
+        """UTF-8 encode code, off the event loop when it's large.
+
+        Args:
+            code: Code content
+
+        Returns:
+            Encoded content
+        """
+        if len(code) < self.ENCODE_IN_THREAD_CHARS:
+            return code.encode('utf-8')
+        return await asyncio.to_thread(code.encode, 'utf-8')
+
+    async def _compress(self, content: bytes) -> Tuple[bytes, bool]:
+        """Gzip content if worthwhile, off the event loop when it's large.
+
+        Args:
+            content: Encoded code
+
+        Returns:
+            (payload, compressed) tuple
+        """
+        if len(content) < self.ENCODE_IN_THREAD_CHARS:
+            return _maybe_gzip(content, self.COMPRESS_MIN_BYTES)
+        return await asyncio.to_thread(_maybe_gzip, content, self.COMPRESS_MIN_BYTES)
+
+    def _check_upload(
+        self,
+        size_bytes: int,
+        recipient: str,
+        filename: str
+    ) -> Optional[str]:
+        """Validate an upload and return its sanitized filename.
+
+        Args:
+            size_bytes: Attachment size in bytes
+            recipient: Phone number to send to
+            filename: Requested display filename
+
+        Returns:
+            Sanitized filename, or None if the upload must be rejected
+        """
         # Validate size
-        size_bytes = len(code.encode('utf-8'))
         if size_bytes > self.MAX_SIZE_BYTES:
-            logger.error(
+            self._log.error(
                 "file_too_large",
                 size_bytes=size_bytes,
                 max_bytes=self.MAX_SIZE_BYTES,
@@ -56,7 +421,7 @@ class AttachmentHandler:
             return None
 
         if size_bytes > self.LARGE_FILE_THRESHOLD:
-            logger.warning(
+            self._log.warning(
                 "large_file_warning",
                 size_mb=size_bytes / 1024 / 1024,
                 filename=filename
@@ -67,121 +432,170 @@ class AttachmentHandler:
 
         # Validate recipient (E.164 format)
         if not self._is_valid_phone(recipient):
-            logger.error(
+            self._log.error(
                 "invalid_recipient",
                 recipient=recipient
             )
             return None
 
-        temp_path = None
-        try:
-            # Create temp file with code content
-            suffix = Path(safe_filename).suffix or ".txt"
-            temp_path = self._create_temp_file(code, suffix)
-
-            # Upload to Signal via REST API
-            attachment_id = await self._upload_attachment(
-                temp_path, recipient, safe_filename
-            )
-
-            return attachment_id
+        return safe_filename
 
-        finally:
-            # Cleanup temp file (even if upload failed)
-            if temp_path and os.path.exists(temp_path):
-                os.unlink(temp_path)
-                logger.debug(
-                    "temp_file_cleaned",
-                    path=temp_path
-                )
-
-    def _create_temp_file(self, content: str, suffix: str) -> str:
-        """Write content to temp file and return path.
+    async def _upload_attachment(
+        self,
+        source: Union[bytes, BinaryIO],
+        recipient: str,
+        display_name: str
+    ) -> Optional[str]:
+        """Upload attachment to Signal via REST API.
 
         Args:
-            content: Content to write
-            suffix: File suffix (e.g., ".py")
+            source: Attachment content, or an open binary file to stream
+            recipient: Phone number to send to
+            display_name: Filename to display in Signal
 
         Returns:
-            Path to created temp file
+            Timestamp from Signal API, or None if upload failed
         """
-        with tempfile.NamedTemporaryFile(
-            mode='w',
-            suffix=suffix,
-            delete=False,
-            encoding='utf-8'
-        ) as f:
-            f.write(content)
-            path = f.name
-
-        logger.debug(
-            "temp_file_created",
-            path=path,
-            size_bytes=len(content.encode('utf-8'))
-        )
-
-        return path
+        return await self._upload_attachments([(source, display_name)], recipient)
 
-    async def _upload_attachment(
+    async def _upload_attachments(
         self,
-        file_path: str,
-        recipient: str,
-        display_name: str
+        attachments: List[Tuple[Union[bytes, BinaryIO], str]],
+        recipient: str
     ) -> Optional[str]:
-        """Upload file to Signal via REST API.
+        """Upload one or more attachments in a single /v2/send request.
 
         Args:
-            file_path: Path to file to upload
+            attachments: (source, display_name) pairs; a source is the
+                content, or an open binary file to stream
             recipient: Phone number to send to
-            display_name: Filename to display in Signal
 
         Returns:
             Timestamp from Signal API, or None if upload failed
         """
-        url = f"{self.signal_api_url}/v2/send"
-        data = {
-            "recipients": [recipient],
-            "message": f"📎 {display_name}",  # Caption with filename
-            "attachments": [file_path]
-        }
+        filenames = ", ".join(name for _, name in attachments)
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        timestamp = result.get("timestamp")
-
-                        logger.info(
-                            "attachment_uploaded",
-                            recipient=recipient,
-                            filename=display_name,
-                            timestamp=timestamp
+            session = await self._get_session()
+            for attempt in range(1, self.UPLOAD_ATTEMPTS + 1):
+                try:
+                    async with self._upload_semaphore:
+                        return await self._post_send_body(
+                            session, attachments, recipient, filenames
                         )
-
-                        return timestamp
-                    else:
-                        # Log error but don't crash
-                        error_text = await response.text()
-                        logger.error(
-                            "attachment_upload_failed",
-                            status=response.status,
-                            error=error_text,
-                            recipient=recipient,
-                            filename=display_name
-                        )
-                        return None
+                except aiohttp.ClientConnectorError as e:
+                    # Only retried when no connection was made: nothing was
+                    # sent, so no duplicate message and no body consumed
+                    if attempt == self.UPLOAD_ATTEMPTS:
+                        raise
+                    retry_delay = self.UPLOAD_RETRY_DELAY * 2 ** (attempt - 1)
+                    self._log.warning(
+                        "attachment_upload_retry",
+                        attempt=attempt,
+                        retry_delay=retry_delay,
+                        error=str(e),
+                        filename=filenames
+                    )
+                    await asyncio.sleep(retry_delay)
 
         except Exception as e:
-            logger.error(
+            self._log.error(
                 "attachment_upload_exception",
                 error=str(e),
                 error_type=type(e).__name__,
                 recipient=recipient,
-                filename=display_name
+                filename=filenames
             )
             return None
 
+    async def _post_send_body(
+        self,
+        session: aiohttp.ClientSession,
+        attachments: List[Tuple[Union[bytes, BinaryIO], str]],
+        recipient: str,
+        filenames: str
+    ) -> Optional[str]:
+        """POST the streamed /v2/send body once and read the result.
+
+        Args:
+            session: Upload session
+            attachments: (source, display_name) pairs to attach
+            recipient: Phone number to send to
+            filenames: Display names joined for logging
+
+        Returns:
+            Timestamp from Signal API, or None if the API rejected the upload
+        """
+        body = self._stream_send_body(attachments, recipient)
+
+        async with session.post(
+            self._send_url, data=body, headers=self._JSON_HEADERS
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                timestamp = result.get("timestamp")
+
+                self._log.info(
+                    "attachment_uploaded",
+                    recipient=recipient,
+                    filename=filenames,
+                    timestamp=timestamp
+                )
+
+                return timestamp
+            else:
+                # Log error but don't crash
+                error_text = await response.text()
+                self._log.error(
+                    "attachment_upload_failed",
+                    status=response.status,
+                    error=error_text,
+                    recipient=recipient,
+                    filename=filenames
+                )
+                return None
+
+    async def _stream_send_body(
+        self,
+        attachments: List[Tuple[Union[bytes, BinaryIO], str]],
+        recipient: str
+    ) -> AsyncIterator[bytes]:
+        """Yield the /v2/send JSON body, base64-encoding content in chunks.
+
+        The REST API runs in its own container and can't read our files,
+        so the content goes inline as base64 data URIs. Streaming keeps
+        the encoded copy to one chunk instead of whole attachments.
+
+        Args:
+            attachments: (source, display_name) pairs to attach
+            recipient: Phone number to send to
+
+        Yields:
+            Consecutive pieces of the JSON request body
+        """
+        # Caption with filenames
+        message = "\n".join(f"📎 {name}" for _, name in attachments)
+
+        # Only the recipient and caption vary; the rest is fixed JSON
+        yield self._SEND_BODY_HEAD.format(
+            sender=self._sender_field,
+            recipient=json.dumps(recipient),
+            message=json.dumps(message)
+        ).encode("utf-8")
+
+        for index, (source, display_name) in enumerate(attachments):
+            if index:
+                yield b", "
+            # Opening quote and data URI prefix; base64 chunks follow
+            yield _data_uri_prefix(display_name)
+
+            for chunk in _b64_chunks(source, self.B64_CHUNK_BYTES):
+                yield chunk
+
+            yield b'"'
+
+        yield b"]}"
+
     def _sanitize_filename(self, filename: str) -> str:
         """Remove path traversal and invalid characters.
 
@@ -191,12 +605,7 @@ class AttachmentHandler:
         Returns:
             Sanitized filename safe for cross-platform use
         """
-        # Get basename (removes any directory path)
-        safe = os.path.basename(filename)
-        # Remove/replace invalid chars for cross-platform safety
-        safe = re.sub(r'[<>:"/\\|?*]', '_', safe)
-        # Ensure not empty
-        return safe if safe else "code.txt"
+        return _sanitize_filename(filename)
 
     def _is_valid_phone(self, phone: str) -> bool:
         """Validate E.164 phone number format.
@@ -207,6 +616,4 @@ class AttachmentHandler:
         Returns:
             True if valid E.164 format, False otherwise
         """
-        # E.164: +[country][number], 1-15 digits total
-        pattern = r'^\+[1-9]\d{1,14}$'
-        return bool(re.match(pattern, phone))
+        return _is_e164(phone)
@@ -4,7 +4,8 @@ Thread command handlers for Signal bot.
 GREEN Phase: Implement ThreadCommands to make tests pass.
 """
 
-from pathlib import Path
+import os
+import stat
 from src.thread import ThreadMapper, ThreadMappingError
 
 
@@ -73,9 +74,12 @@ class ThreadCommands:
             return "Error: Missing project path\n\nUsage: /thread map <project_path>"
 
         # Validate path exists (ThreadMapper.map also validates, but provide clear message)
-        path = Path(project_path)
-        if not path.exists():
+        try:
+            st = os.stat(project_path)
+        except (OSError, ValueError):
             return f"Error: Path does not exist: {project_path}"
+        if not stat.S_ISDIR(st.st_mode):
+            return f"Error: Path is not a directory: {project_path}"
 
         try:
             # Create mapping
@@ -5,6 +5,8 @@ GREEN Phase: Implementation to make tests pass.
 """
 
 import asyncio
+import os
+import stat
 import aiosqlite
 import structlog
 from dataclasses import dataclass
@@ -14,6 +16,27 @@ from typing import Optional
 
 logger = structlog.get_logger(__name__)
 
+_SQL_INSERT_MAPPING = """
+    INSERT INTO thread_mappings (thread_id, project_path, created_at, updated_at)
+    VALUES (?, ?, ?, ?)
+"""
+_SQL_GET_BY_THREAD = """
+    SELECT thread_id, project_path, created_at, updated_at
+    FROM thread_mappings
+    WHERE thread_id = ?
+"""
+_SQL_GET_BY_PATH = """
+    SELECT thread_id, project_path, created_at, updated_at
+    FROM thread_mappings
+    WHERE project_path = ?
+"""
+_SQL_LIST_MAPPINGS = """
+    SELECT thread_id, project_path, created_at, updated_at
+    FROM thread_mappings
+    ORDER BY created_at DESC
+"""
+_SQL_DELETE_MAPPING = "DELETE FROM thread_mappings WHERE thread_id = ?"
+
 
 class ThreadMappingError(Exception):
     """Raised when thread mapping operation fails."""
@@ -63,7 +86,11 @@ class ThreadMapper:
         Creates database directory if needed.
         Enables WAL mode for concurrent access.
         Creates tables and indexes if not exist.
+        Idempotent: calling again on an open mapper is a no-op.
         """
+        if self._connection is not None:
+            return
+
         # Create directory if needed
         db_dir = Path(self.db_path).parent
         db_dir.mkdir(parents=True, exist_ok=True)
@@ -98,11 +125,16 @@ class ThreadMapper:
             ThreadMapping with timestamps
 
         Raises:
-            ThreadMappingError: If path doesn't exist, thread already mapped, or path already mapped
+            ThreadMappingError: If path doesn't exist or isn't a directory, thread already mapped,
+                or path already mapped
         """
-        # Validate: Path must exist
-        if not Path(project_path).exists():
+        # Validate: Path must be an existing directory (one stat, no Path objects)
+        try:
+            st = os.stat(project_path)
+        except (OSError, ValueError):
             raise ThreadMappingError(f"Path does not exist: {project_path}")
+        if not stat.S_ISDIR(st.st_mode):
+            raise ThreadMappingError(f"Path is not a directory: {project_path}")
 
         # Validate: Thread not already mapped
         existing_by_thread = await self.get_by_thread(thread_id)
@@ -119,10 +151,7 @@ class ThreadMapper:
 
         async with self._lock:
             await self._connection.execute(
-                """
-                INSERT INTO thread_mappings (thread_id, project_path, created_at, updated_at)
-                VALUES (?, ?, ?, ?)
-                """,
+                _SQL_INSERT_MAPPING,
                 (
                     thread_id,
                     project_path,
@@ -157,11 +186,7 @@ class ThreadMapper:
         """
         async with self._lock:
             cursor = await self._connection.execute(
-                """
-                SELECT thread_id, project_path, created_at, updated_at
-                FROM thread_mappings
-                WHERE thread_id = ?
-                """,
+                _SQL_GET_BY_THREAD,
                 (thread_id,)
             )
             row = await cursor.fetchone()
@@ -183,11 +208,7 @@ class ThreadMapper:
         """
         async with self._lock:
             cursor = await self._connection.execute(
-                """
-                SELECT thread_id, project_path, created_at, updated_at
-                FROM thread_mappings
-                WHERE project_path = ?
-                """,
+                _SQL_GET_BY_PATH,
                 (project_path,)
             )
             row = await cursor.fetchone()
@@ -205,13 +226,7 @@ class ThreadMapper:
             List of mappings, newest first
         """
         async with self._lock:
-            cursor = await self._connection.execute(
-                """
-                SELECT thread_id, project_path, created_at, updated_at
-                FROM thread_mappings
-                ORDER BY created_at DESC
-                """
-            )
+            cursor = await self._connection.execute(_SQL_LIST_MAPPINGS)
             rows = await cursor.fetchall()
 
         return [self._row_to_mapping(row) for row in rows]
@@ -227,10 +242,7 @@ class ThreadMapper:
         """
         async with self._lock:
             await self._connection.execute(
-                """
-                DELETE FROM thread_mappings
-                WHERE thread_id = ?
-                """,
+                _SQL_DELETE_MAPPING,
                 (thread_id,)
             )
             await self._connection.commit()
@@ -9,21 +9,42 @@ Tests follow TDD RED-GREEN-REFACTOR:
 
 import pytest
 from src.approval.commands import ApprovalCommands
-from src.approval.manager import ApprovalManager, ApprovalRequest
+from src.approval.manager import ApprovalManager, ApprovalRequest, sequential_ids
 from src.approval.models import ApprovalState
 
 
+@pytest.fixture
+def env():
+    """ApprovalManager and the ApprovalCommands wired to it.
+
+    IDs come from a counter (no OS RNG) but keep the 36-char UUID shape.
+    """
+    manager = ApprovalManager(id_factory=sequential_ids())
+    return manager, ApprovalCommands(manager)
+
+
+@pytest.fixture
+def make_pending(env):
+    """Factory creating n pending approval requests on the env manager."""
+    manager, _ = env
+
+    def _make(n=1):
+        return [
+            manager.request({"tool": "Edit"}, reason=f"File {i}")
+            for i in range(n)
+        ]
+
+    return _make
+
+
 class TestApprovalCommandParsing:
     """Test command parsing for approve/reject"""
 
     @pytest.mark.asyncio
-    async def test_approve_with_id_returns_success_message(self):
+    async def test_approve_with_id_returns_success_message(self, env, make_pending):
         """approve {id} calls manager.approve() and returns success"""
-        manager = ApprovalManager()
-        commands = ApprovalCommands(manager)
-
-        # Create pending approval
-        request = manager.request({"tool": "Edit"}, reason="Modifies file")
+        manager, commands = env
+        [request] = make_pending()
         approval_id = request.id
 
         result = await commands.handle(f"approve {approval_id}")
@@ -33,13 +54,10 @@ class TestApprovalCommandParsing:
         assert manager.get(approval_id).state == ApprovalState.APPROVED
 
     @pytest.mark.asyncio
-    async def test_reject_with_id_returns_success_message(self):
+    async def test_reject_with_id_returns_success_message(self, env, make_pending):
         """reject {id} calls manager.reject() and returns success"""
-        manager = ApprovalManager()
-        commands = ApprovalCommands(manager)
-
-        # Create pending approval
-        request = manager.request({"tool": "Write"}, reason="Creates file")
+        manager, commands = env
+        [request] = make_pending()
         approval_id = request.id
 
         result = await commands.handle(f"reject {approval_id}")
@@ -49,43 +67,83 @@ class TestApprovalCommandParsing:
         assert manager.get(approval_id).state == ApprovalState.REJECTED
 
     @pytest.mark.asyncio
-    async def test_approve_all_approves_multiple_pending(self):
+    async def test_approve_all_approves_multiple_pending(self, env, make_pending):
         """approve all approves all pending requests"""
-        manager = ApprovalManager()
-        commands = ApprovalCommands(manager)
-
-        # Create 3 pending approvals
-        req1 = manager.request({"tool": "Edit"}, reason="File 1")
-        req2 = manager.request({"tool": "Write"}, reason="File 2")
-        req3 = manager.request({"tool": "Bash"}, reason="Command")
+        manager, commands = env
+        requests = make_pending(3)
 
         result = await commands.handle("approve all")
 
         # Should approve all and return count
         assert result == "✅ Approved all pending (3)"
-        assert manager.get(req1.id).state == ApprovalState.APPROVED
-        assert manager.get(req2.id).state == ApprovalState.APPROVED
-        assert manager.get(req3.id).state == ApprovalState.APPROVED
+        for request in requests:
+            assert manager.get(request.id).state == ApprovalState.APPROVED
 
     @pytest.mark.asyncio
-    async def test_unknown_command_returns_none(self):
+    async def test_unknown_command_returns_none(self, env):
         """Unknown commands return None (let SessionCommands handle)"""
-        manager = ApprovalManager()
-        commands = ApprovalCommands(manager)
+        _, commands = env
 
         result = await commands.handle("some other command")
 
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_command_without_argument_returns_none(self, env):
+        """Bare approve/reject fall through to SessionCommands"""
+        _, commands = env
+
+        assert await commands.handle("approve") is None
+        assert await commands.handle("  reject  ") is None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("separator", ["\t", "\n", "  "])
+    async def test_any_whitespace_separates_arguments(self, env, make_pending, separator):
+        """Tabs and newlines separate command and id like spaces do"""
+        manager, commands = env
+        [request] = make_pending()
+
+        result = await commands.handle(f"approve{separator}{request.id}")
+
+        assert result == f"✅ Approved {request.id[:8]}"
+        assert manager.get(request.id).state == ApprovalState.APPROVED
+
+    @pytest.mark.asyncio
+    async def test_approve_all_with_tab_separator(self, env):
+        """approve<TAB>all is routed like approve all"""
+        _, commands = env
+
+        assert await commands.handle("approve\tall") == "✅ Approved all pending (0)"
+
+    @pytest.mark.asyncio
+    async def test_text_after_id_is_ignored(self, env, make_pending):
+        """Trailing text on a new line does not become part of the id"""
+        manager, commands = env
+        [request] = make_pending()
+
+        result = await commands.handle(f"reject {request.id}\nthanks")
+
+        assert result == f"❌ Rejected {request.id[:8]}"
+        assert manager.get(request.id).state == ApprovalState.REJECTED
+
+    @pytest.mark.asyncio
+    async def test_command_keyword_is_case_insensitive(self, env, make_pending):
+        """APPROVE ALL is routed like approve all"""
+        _, commands = env
+        make_pending()
+
+        result = await commands.handle("APPROVE ALL")
+
+        assert result == "✅ Approved all pending (1)"
+
 
 class TestApprovalCommandEdgeCases:
     """Test edge cases and error handling"""
 
     @pytest.mark.asyncio
-    async def test_approve_nonexistent_id_returns_error(self):
+    async def test_approve_nonexistent_id_returns_error(self, env):
         """Approving non-existent ID returns error message"""
-        manager = ApprovalManager()
-        commands = ApprovalCommands(manager)
+        _, commands = env
 
         result = await commands.handle("approve nonexistent-id")
 
@@ -93,10 +151,9 @@ class TestApprovalCommandEdgeCases:
         assert "not found" in result
 
     @pytest.mark.asyncio
-    async def test_reject_nonexistent_id_returns_error(self):
+    async def test_reject_nonexistent_id_returns_error(self, env):
         """Rejecting non-existent ID returns error message"""
-        manager = ApprovalManager()
-        commands = ApprovalCommands(manager)
+        _, commands = env
 
         result = await commands.handle("reject nonexistent-id")
 
@@ -104,13 +161,12 @@ class TestApprovalCommandEdgeCases:
         assert "not found" in result
 
     @pytest.mark.asyncio
-    async def test_approve_already_approved_is_idempotent(self):
+    async def test_approve_already_approved_is_idempotent(self, env, make_pending):
         """Approving already-approved request returns success"""
-        manager = ApprovalManager()
-        commands = ApprovalCommands(manager)
+        manager, commands = env
 
         # Create and approve
-        request = manager.request({"tool": "Edit"}, reason="Modifies file")
+        [request] = make_pending()
         manager.approve(request.id)
 
         # Approve again
@@ -120,25 +176,21 @@ class TestApprovalCommandEdgeCases:
         assert manager.get(request.id).state == ApprovalState.APPROVED
 
     @pytest.mark.asyncio
-    async def test_approve_all_with_no_pending_returns_zero_count(self):
+    async def test_approve_all_with_no_pending_returns_zero_count(self, env):
         """approve all with no pending requests returns count 0"""
-        manager = ApprovalManager()
-        commands = ApprovalCommands(manager)
+        _, commands = env
 
         result = await commands.handle("approve all")
 
         assert result == "✅ Approved all pending (0)"
 
     @pytest.mark.asyncio
-    async def test_approve_all_skips_non_pending(self):
+    async def test_approve_all_skips_non_pending(self, env, make_pending):
         """approve all only approves PENDING, skips already-approved/rejected"""
-        manager = ApprovalManager()
-        commands = ApprovalCommands(manager)
+        manager, commands = env
 
         # Create 3 requests, approve one, reject another
-        req1 = manager.request({"tool": "Edit"}, reason="File 1")
-        req2 = manager.request({"tool": "Write"}, reason="File 2")
-        req3 = manager.request({"tool": "Bash"}, reason="Command")
+        req1, req2, req3 = make_pending(3)
 
         manager.approve(req1.id)
         manager.reject(req2.id)
@@ -155,10 +207,9 @@ class TestApprovalCommandEdgeCases:
 class TestApprovalCommandHelp:
     """Test help message generation"""
 
-    def test_help_returns_command_reference(self):
+    def test_help_returns_command_reference(self, env):
         """help() returns formatted command reference"""
-        manager = ApprovalManager()
-        commands = ApprovalCommands(manager)
+        _, commands = env
 
         help_text = commands.help()
 
@@ -176,13 +227,12 @@ class TestApprovalCommandMessageFormat:
     """Test message format for mobile-friendly display"""
 
     @pytest.mark.asyncio
-    async def test_approval_id_truncated_to_8_chars(self):
+    async def test_approval_id_truncated_to_8_chars(self, env, make_pending):
         """Approval IDs truncated to 8 chars (mobile-friendly)"""
-        manager = ApprovalManager()
-        commands = ApprovalCommands(manager)
+        _, commands = env
 
         # Create request with full UUID
-        request = manager.request({"tool": "Edit"}, reason="Modifies file")
+        [request] = make_pending()
         full_id = request.id
         assert len(full_id) == 36  # UUID4 format
 
@@ -134,3 +134,13 @@ class TestOperationDetector:
         tool_call = ToolCall(type=OutputType.TOOL_CALL, tool="EDIT", target="file.py")
         op_type, _ = detector.classify(tool_call)
         assert op_type == OperationType.DESTRUCTIVE
+
+    def test_duck_typed_tool_call_without_cached_name(self):
+        """Objects with only a .tool attribute are still classified."""
+        detector = OperationDetector()
+
+        class BareToolCall:
+            tool = "Grep"
+
+        op_type, _ = detector.classify(BareToolCall())
+        assert op_type == OperationType.SAFE
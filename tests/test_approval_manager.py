@@ -12,7 +12,12 @@ import pytest
 from datetime import datetime, UTC, timedelta
 
 from src.approval.models import ApprovalState
-from src.approval.manager import ApprovalManager, ApprovalRequest
+from src.approval.manager import (
+    ApprovalManager,
+    ApprovalRequest,
+    ToolCallRecord,
+    sequential_ids,
+)
 
 
 class TestApprovalStateTransitions:
@@ -26,11 +31,33 @@ class TestApprovalStateTransitions:
         request = manager.request(tool_call, reason="Edit modifies file")
 
         assert request.state == ApprovalState.PENDING
-        assert request.tool_call == tool_call
+        assert request.tool_call == ToolCallRecord(tool="Edit", target="src/main.py")
         assert request.reason == "Edit modifies file"
         assert request.id is not None
         assert isinstance(request.timestamp, datetime)
 
+    def test_approval_request_has_no_instance_dict(self):
+        """ApprovalRequest uses __slots__ (no per-instance __dict__)"""
+        manager = ApprovalManager()
+
+        request = manager.request({"tool": "Edit"}, reason="Modifies file")
+
+        assert not hasattr(request, "__dict__")
+        with pytest.raises(AttributeError):
+            request.extra = True
+
+    def test_tool_call_dict_stored_as_record(self):
+        """Mapping tool calls are normalized to a compact ToolCallRecord"""
+        manager = ApprovalManager()
+
+        request = manager.request(
+            {"tool": "Bash", "command": "rm -rf build"}, reason="Command"
+        )
+
+        assert request.tool_call == ToolCallRecord(tool="Bash", command="rm -rf build")
+        assert request.tool_call.target is None
+        assert request.tool_call != ToolCallRecord(tool="Bash", command="ls")
+
     def test_approve_transitions_pending_to_approved(self):
         """Approving pending request transitions to APPROVED"""
         manager = ApprovalManager()
@@ -219,6 +246,25 @@ class TestApprovalRequestTracking:
         assert pending[0].id == req3.id
         assert pending[0].state == ApprovalState.PENDING
 
+    def test_pending_index_tracks_every_transition(self):
+        """Settled requests leave the pending index but stay retrievable"""
+        manager = ApprovalManager()
+
+        requests = [
+            manager.request({"tool": "Edit"}, reason=f"File {i}") for i in range(4)
+        ]
+        manager.approve(requests[0].id)
+        manager.reject(requests[1].id)
+        requests[2].timestamp = datetime.now(UTC) - timedelta(minutes=11)
+        manager.check_timeouts()
+
+        assert list(manager._pending) == [requests[3].id]
+        assert all(manager.get(r.id) is r for r in requests)
+
+        manager.approve_all()
+
+        assert manager._pending == {}
+
 
 class TestApprovalBatchOperations:
     """Test batch approval operations"""
@@ -287,3 +333,85 @@ class TestApprovalBatchOperations:
         # approve_all should approve just that one
         count = manager.approve_all()
         assert count == 1
+
+    def test_approve_all_skips_timed_out(self):
+        """approve_all() does not resurrect requests that timed out"""
+        manager = ApprovalManager()
+
+        req1 = manager.request({"tool": "Edit"}, reason="File 1")
+        req2 = manager.request({"tool": "Write"}, reason="File 2")
+        req1.timestamp = datetime.now(UTC) - timedelta(minutes=11)
+
+        manager.check_timeouts()
+        count = manager.approve_all()
+
+        assert count == 1
+        assert manager.get(req1.id).state == ApprovalState.TIMEOUT
+        assert manager.get(req2.id).state == ApprovalState.APPROVED
+        assert manager.list_pending() == []
+
+
+class TestApprovalIdFactory:
+    """Test injectable approval ID generation"""
+
+    def test_default_ids_are_uuid4(self):
+        """Default factory produces UUID4 strings"""
+        manager = ApprovalManager()
+
+        request = manager.request({"tool": "Edit"}, reason="Modifies file")
+
+        assert len(request.id) == 36
+        assert request.id[14] == "4"
+
+    def test_custom_id_factory_is_used(self):
+        """request() takes IDs from the injected factory"""
+        ids = iter(["first", "second"])
+        manager = ApprovalManager(id_factory=lambda: next(ids))
+
+        req1 = manager.request({"tool": "Edit"}, reason="File 1")
+        req2 = manager.request({"tool": "Write"}, reason="File 2")
+
+        assert req1.id == "first"
+        assert req2.id == "second"
+        assert manager.get("second") is req2
+
+    def test_sequential_ids_have_distinct_short_prefixes(self):
+        """sequential_ids() keeps UUID shape and unique 8-char prefixes"""
+        manager = ApprovalManager(id_factory=sequential_ids())
+
+        ids = [manager.request({"tool": "Edit"}, reason="x").id for _ in range(20)]
+
+        assert all(len(approval_id) == 36 for approval_id in ids)
+        assert len({approval_id[:8] for approval_id in ids}) == 20
+        assert ids[0].startswith("00000001-")
+
+
+class TestApprovalSettledEvent:
+    """Test settled() events used by waiters"""
+
+    @pytest.mark.asyncio
+    async def test_settled_set_on_each_transition(self):
+        """approve/reject/timeout all set the settled event"""
+        manager = ApprovalManager()
+
+        req1 = manager.request({"tool": "Edit"}, reason="File 1")
+        req2 = manager.request({"tool": "Write"}, reason="File 2")
+        req3 = manager.request({"tool": "Bash"}, reason="Command")
+        events = [manager.settled(r.id) for r in (req1, req2, req3)]
+        assert not any(event.is_set() for event in events)
+
+        manager.approve(req1.id)
+        manager.reject(req2.id)
+        req3.timestamp = datetime.now(UTC) - timedelta(minutes=11)
+        manager.check_timeouts()
+
+        assert all(event.is_set() for event in events)
+
+    def test_settled_already_set_for_terminal_request(self):
+        """settled() on a non-PENDING request is already set"""
+        manager = ApprovalManager()
+
+        request = manager.request({"tool": "Edit"}, reason="File 1")
+        manager.approve(request.id)
+
+        assert manager.settled(request.id).is_set()
@@ -1,24 +1,73 @@
 """Tests for Signal attachment handling."""
 
+import asyncio
+import base64
+import gzip
+import json
 import os
-import tempfile
-from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import pytest
-
-from src.signal.attachment_handler import AttachmentHandler
-
-
-@pytest.fixture
-def handler():
-    """Create AttachmentHandler instance for testing."""
-    return AttachmentHandler(signal_api_url="http://localhost:8080")
-
-
-@pytest.fixture
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.signal.attachment_handler import (
+    AttachmentHandler,
+    _data_uri_prefix,
+    _maybe_gzip,
+    _sanitize_filename,
+)
+
+
+class FakeSignalAPI:
+    """In-process stand-in for signal-cli-rest-api's /v2/send endpoint.
+
+    Records every request body and answers with the configured status.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.status = 200
+        self.payload = {"timestamp": "123456789"}
+
+    def respond(self, status=200, payload=None, text=None):
+        """Set the response returned by subsequent sends."""
+        self.status = status
+        self.payload = text if text is not None else payload
+
+    async def send(self, request):
+        self.requests.append(json.loads(await request.read()))
+        if isinstance(self.payload, str):
+            return web.Response(status=self.status, text=self.payload)
+        return web.json_response(self.payload, status=self.status)
+
+
+@pytest_asyncio.fixture
+async def signal_api():
+    """Run FakeSignalAPI on a loopback port for the duration of a test."""
+    api = FakeSignalAPI()
+    app = web.Application(client_max_size=200 * 1024 * 1024)
+    app.router.add_post("/v2/send", api.send)
+    server = TestServer(app)
+    await server.start_server()
+    api.url = str(server.make_url("")).rstrip("/")
+    yield api
+    await server.close()
+
+
+@pytest_asyncio.fixture
+async def handler(signal_api):
+    """Create AttachmentHandler instance pointed at the fake Signal API."""
+    handler = AttachmentHandler(signal_api_url=signal_api.url)
+    yield handler
+    await handler.aclose()
+
+
+@pytest.fixture(scope="session")
 def sample_code():
-    """Sample code content for testing."""
+    """Sample code content for testing (immutable, shared by all tests)."""
     return """def hello_world():
     print("Hello, World!")
     return 42
@@ -28,321 +77,496 @@ if __name__ == "__main__":
 """
 
 
+@pytest.fixture(scope="session")
+def large_code():
+    """~700KB of highly compressible code (immutable, shared by all tests)."""
+    return "# Line\n" * 100000
+
+
 class TestAttachmentHandler:
     """Test AttachmentHandler for Signal file uploads."""
 
     @pytest.mark.asyncio
-    async def test_send_code_file_creates_temp_file(self, handler, sample_code):
-        """Test that send_code_file creates temp file with code content."""
-        with patch.object(handler, '_upload_attachment', new_callable=AsyncMock) as mock_upload:
+    async def test_send_code_file_uploads_from_memory(self, handler, sample_code):
+        """Test that send_code_file uploads the encoded code without a temp file."""
+        with patch.object(handler, '_upload_attachment', new_callable=AsyncMock) as mock_upload, \
+                patch('tempfile.NamedTemporaryFile', side_effect=AssertionError), \
+                patch('tempfile.mkstemp', side_effect=AssertionError):
             mock_upload.return_value = "mock_attachment_id"
 
-            # Track temp file creation
-            temp_files_created = []
-            original_create = handler._create_temp_file
+            result = await handler.send_code_file(
+                recipient="+12345678900",
+                code=sample_code,
+                filename="test.py"
+            )
 
-            def track_temp_file(content, suffix):
-                path = original_create(content, suffix)
-                temp_files_created.append(path)
-                return path
+            assert result == "mock_attachment_id"
+            mock_upload.assert_called_once()
+            assert mock_upload.call_args[0][0] == sample_code.encode('utf-8')
 
-            with patch.object(handler, '_create_temp_file', side_effect=track_temp_file):
-                result = await handler.send_code_file(
-                    recipient="+12345678900",
-                    code=sample_code,
-                    filename="test.py"
-                )
+    @pytest.mark.asyncio
+    async def test_send_code_file_uploads_to_signal_api(self, handler, signal_api, sample_code):
+        """Test that send_code_file uploads to Signal via REST API."""
+        signal_api.respond(payload={"timestamp": "123456789"})
 
-                # Verify temp file was created
-                assert len(temp_files_created) == 1
-                temp_path = temp_files_created[0]
+        result = await handler.send_code_file(
+            recipient="+12345678900",
+            code=sample_code,
+            filename="test.py"
+        )
 
-                # Verify content was written (file should be deleted by now)
-                # We'll verify through the upload call instead
-                mock_upload.assert_called_once()
-                assert mock_upload.call_args[0][0] == temp_path
+        # Verify the correct endpoint was called once
+        assert len(signal_api.requests) == 1
 
-    @pytest.mark.asyncio
-    async def test_send_code_file_uploads_to_signal_api(self, handler, sample_code):
-        """Test that send_code_file uploads to Signal via REST API."""
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"timestamp": "123456789"})
+        # Verify result is timestamp
+        assert result == "123456789"
 
-        with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-            mock_session = MagicMock()
-            mock_post_cm = AsyncMock()
-            mock_post_cm.__aenter__.return_value = mock_response
-            mock_session.post.return_value = mock_post_cm
+    @pytest.mark.asyncio
+    async def test_send_code_file_includes_filename(self, handler, signal_api, sample_code):
+        """Test that send_code_file includes filename in upload."""
+        await handler.send_code_file(
+            recipient="+12345678900",
+            code=sample_code,
+            filename="user.py"
+        )
+        [sent] = signal_api.requests
 
-            mock_session_cm = AsyncMock()
-            mock_session_cm.__aenter__.return_value = mock_session
-            mock_session_class.return_value = mock_session_cm
+        # Verify filename appears in message/caption
+        assert "user.py" in sent.get('message', '')
 
+    @pytest.mark.asyncio
+    async def test_send_code_file_upload_error_leaves_no_temp_file(
+        self, handler, signal_api, sample_code
+    ):
+        """Test that a failed upload returns None without touching temp files."""
+        signal_api.respond(status=500, text="Server error")
+
+        with patch('tempfile.NamedTemporaryFile', side_effect=AssertionError), \
+                patch('tempfile.mkstemp', side_effect=AssertionError):
             result = await handler.send_code_file(
                 recipient="+12345678900",
                 code=sample_code,
                 filename="test.py"
             )
 
-            # Verify API was called
-            mock_session.post.assert_called_once()
-            call_args = mock_session.post.call_args
+        # Verify result is None on failure
+        assert result is None
 
-            # Verify correct endpoint
-            assert call_args[0][0] == "http://localhost:8080/v2/send"
+    @pytest.mark.asyncio
+    async def test_send_code_file_handles_upload_failures(self, handler, signal_api, sample_code):
+        """Test that send_code_file handles upload failures gracefully."""
+        signal_api.respond(status=500, text="Server error")
 
-            # Verify result is timestamp
-            assert result == "123456789"
+        result = await handler.send_code_file(
+            recipient="+12345678900",
+            code=sample_code,
+            filename="test.py"
+        )
+
+        # Verify returns None on failure (doesn't crash)
+        assert result is None
 
     @pytest.mark.asyncio
-    async def test_send_code_file_includes_filename(self, handler, sample_code):
-        """Test that send_code_file includes filename in upload."""
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"timestamp": "123456789"})
+    async def test_send_code_file_returns_attachment_id(self, handler, signal_api, sample_code):
+        """Test that send_code_file returns attachment ID from Signal API."""
+        signal_api.respond(payload={"timestamp": "987654321"})
 
-        with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-            mock_session = MagicMock()
-            mock_post_cm = AsyncMock()
-            mock_post_cm.__aenter__.return_value = mock_response
-            mock_session.post.return_value = mock_post_cm
+        result = await handler.send_code_file(
+            recipient="+12345678900",
+            code=sample_code,
+            filename="test.py"
+        )
 
-            mock_session_cm = AsyncMock()
-            mock_session_cm.__aenter__.return_value = mock_session
-            mock_session_class.return_value = mock_session_cm
+        # Verify returns timestamp as attachment ID
+        assert result == "987654321"
 
-            await handler.send_code_file(
-                recipient="+12345678900",
-                code=sample_code,
-                filename="user.py"
-            )
+    @pytest.mark.asyncio
+    async def test_send_code_file_handles_empty_code(self, handler, signal_api):
+        """Test that send_code_file handles empty code gracefully."""
+        signal_api.respond(payload={"timestamp": "123456789"})
 
-            # Verify filename appears in message/caption
-            call_args = mock_session.post.call_args
-            json_data = call_args[1]['json']
-            assert "user.py" in json_data.get('message', '')
-
-    @pytest.mark.asyncio
-    async def test_send_code_file_cleans_up_temp_file(self, handler, sample_code):
-        """Test that send_code_file cleans up temp file after upload."""
-        temp_path_created = None
-
-        # Track temp file creation
-        original_create = handler._create_temp_file
-        def track_temp_file(content, suffix):
-            nonlocal temp_path_created
-            path = original_create(content, suffix)
-            temp_path_created = path
-            return path
-
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"timestamp": "123456789"})
-
-        with patch.object(handler, '_create_temp_file', side_effect=track_temp_file):
-            with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-                mock_session = MagicMock()
-                mock_post_cm = AsyncMock()
-                mock_post_cm.__aenter__.return_value = mock_response
-                mock_session.post.return_value = mock_post_cm
-
-                mock_session_cm = AsyncMock()
-                mock_session_cm.__aenter__.return_value = mock_session
-                mock_session_class.return_value = mock_session_cm
-
-                await handler.send_code_file(
-                    recipient="+12345678900",
-                    code=sample_code,
-                    filename="test.py"
-                )
+        result = await handler.send_code_file(
+            recipient="+12345678900",
+            code="",
+            filename="empty.txt"
+        )
 
-                # Verify temp file was deleted
-                assert temp_path_created is not None
-                assert not os.path.exists(temp_path_created)
-
-    @pytest.mark.asyncio
-    async def test_send_code_file_cleans_up_on_error(self, handler, sample_code):
-        """Test that send_code_file cleans up temp file even on upload error."""
-        temp_path_created = None
-
-        # Track temp file creation
-        original_create = handler._create_temp_file
-        def track_temp_file(content, suffix):
-            nonlocal temp_path_created
-            path = original_create(content, suffix)
-            temp_path_created = path
-            return path
-
-        mock_response = AsyncMock()
-        mock_response.status = 500
-        mock_response.text = AsyncMock(return_value="Server error")
-
-        with patch.object(handler, '_create_temp_file', side_effect=track_temp_file):
-            with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-                mock_session = MagicMock()
-                mock_post_cm = AsyncMock()
-                mock_post_cm.__aenter__.return_value = mock_response
-                mock_session.post.return_value = mock_post_cm
-
-                mock_session_cm = AsyncMock()
-                mock_session_cm.__aenter__.return_value = mock_session
-                mock_session_class.return_value = mock_session_cm
-
-                result = await handler.send_code_file(
-                    recipient="+12345678900",
-                    code=sample_code,
-                    filename="test.py"
-                )
+        # Should still work (empty file is valid)
+        assert result == "123456789"
+
+    @pytest.mark.asyncio
+    async def test_send_code_file_handles_large_files(self, handler, signal_api, large_code):
+        """Test that send_code_file handles large code files."""
+        signal_api.respond(payload={"timestamp": "123456789"})
 
-                # Verify temp file was deleted even though upload failed
-                assert temp_path_created is not None
-                assert not os.path.exists(temp_path_created)
-                # Verify result is None on failure
-                assert result is None
+        result = await handler.send_code_file(
+            recipient="+12345678900",
+            code=large_code,
+            filename="large.py"
+        )
+
+        # Should handle large files
+        assert result == "123456789"
 
     @pytest.mark.asyncio
-    async def test_send_code_file_handles_upload_failures(self, handler, sample_code):
-        """Test that send_code_file handles upload failures gracefully."""
-        mock_response = AsyncMock()
-        mock_response.status = 500
-        mock_response.text = AsyncMock(return_value="Server error")
+    async def test_send_code_file_handles_special_chars_in_filename(
+        self, handler, signal_api, sample_code
+    ):
+        """Test that send_code_file handles filenames with special characters."""
+        signal_api.respond(payload={"timestamp": "123456789"})
 
-        with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-            mock_session = MagicMock()
-            mock_post_cm = AsyncMock()
-            mock_post_cm.__aenter__.return_value = mock_response
-            mock_session.post.return_value = mock_post_cm
+        result = await handler.send_code_file(
+            recipient="+12345678900",
+            code=sample_code,
+            filename="my-file_v2.0.py"
+        )
 
-            mock_session_cm = AsyncMock()
-            mock_session_cm.__aenter__.return_value = mock_session
-            mock_session_class.return_value = mock_session_cm
+        # Should handle special chars
+        assert result == "123456789"
 
-            result = await handler.send_code_file(
-                recipient="+12345678900",
-                code=sample_code,
-                filename="test.py"
-            )
 
-            # Verify returns None on failure (doesn't crash)
-            assert result is None
+class TestAttachmentBody:
+    """Test the streamed /v2/send request body."""
 
     @pytest.mark.asyncio
-    async def test_send_code_file_returns_attachment_id(self, handler, sample_code):
-        """Test that send_code_file returns attachment ID from Signal API."""
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"timestamp": "987654321"})
+    async def test_body_carries_base64_data_uri(self, handler, signal_api):
+        """Content spanning several chunks round-trips through the data URI."""
+        code = "print('héllo')\n" * 20000  # > B64_CHUNK_BYTES
+        result = await handler.send_code_file(
+            recipient="+12345678900",
+            code=code,
+            filename="big.py"
+        )
+        [sent] = signal_api.requests
 
-        with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-            mock_session = MagicMock()
-            mock_post_cm = AsyncMock()
-            mock_post_cm.__aenter__.return_value = mock_response
-            mock_session.post.return_value = mock_post_cm
+        assert result == "123456789"
+        assert sent["recipients"] == ["+12345678900"]
+        [attachment] = sent["base64_attachments"]
+        header, _, payload = attachment.partition(",")
+        assert header == "data:text/x-python;filename=big.py;base64"
+        assert base64.b64decode(payload).decode("utf-8") == code
 
-            mock_session_cm = AsyncMock()
-            mock_session_cm.__aenter__.return_value = mock_session
-            mock_session_class.return_value = mock_session_cm
 
-            result = await handler.send_code_file(
-                recipient="+12345678900",
-                code=sample_code,
-                filename="test.py"
-            )
+    @pytest.mark.asyncio
+    async def test_body_includes_sender_number(self, signal_api, sample_code):
+        """A handler with sender_number sends it as the /v2/send "number"."""
+        handler = AttachmentHandler(signal_api.url, sender_number="+19995550100")
+
+        await handler.send_code_file("+12345678900", sample_code, "test.py")
+        await handler.aclose()
+        [sent] = signal_api.requests
 
-            # Verify returns timestamp as attachment ID
-            assert result == "987654321"
+        assert sent["number"] == "+19995550100"
+        assert sent["recipients"] == ["+12345678900"]
 
     @pytest.mark.asyncio
-    async def test_send_code_file_handles_empty_code(self, handler):
-        """Test that send_code_file handles empty code gracefully."""
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"timestamp": "123456789"})
+    async def test_body_omits_number_without_sender(self, handler, signal_api, sample_code):
+        """Without sender_number the field is left out, not sent as null."""
+        await handler.send_code_file("+12345678900", sample_code, "test.py")
+        [sent] = signal_api.requests
 
-        with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-            mock_session = MagicMock()
-            mock_post_cm = AsyncMock()
-            mock_post_cm.__aenter__.return_value = mock_response
-            mock_session.post.return_value = mock_post_cm
+        assert "number" not in sent
 
-            mock_session_cm = AsyncMock()
-            mock_session_cm.__aenter__.return_value = mock_session
-            mock_session_class.return_value = mock_session_cm
 
-            result = await handler.send_code_file(
-                recipient="+12345678900",
-                code="",
-                filename="empty.txt"
-            )
+class TestAttachmentEncoding:
+    """Test where code gets UTF-8 encoded."""
 
-            # Should still work (empty file is valid)
-            assert result == "123456789"
+    @pytest.mark.asyncio
+    async def test_large_code_encoded_in_thread(self, handler):
+        """Code past ENCODE_IN_THREAD_CHARS is encoded off the event loop."""
+        large_code = "é" * AttachmentHandler.ENCODE_IN_THREAD_CHARS
+
+        with patch('src.signal.attachment_handler.asyncio.to_thread',
+                   wraps=asyncio.to_thread) as mock_to_thread:
+            content = await handler._encode_code(large_code)
+
+        assert content == large_code.encode('utf-8')
+        mock_to_thread.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_send_code_file_handles_large_files(self, handler):
-        """Test that send_code_file handles large code files."""
-        # Create large code content (1MB)
-        large_code = "# Line\n" * 100000
+    async def test_small_code_encoded_inline(self, handler, sample_code):
+        """Short code skips the thread hop."""
+        with patch('src.signal.attachment_handler.asyncio.to_thread') as mock_to_thread:
+            content = await handler._encode_code(sample_code)
 
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"timestamp": "123456789"})
+        assert content == sample_code.encode('utf-8')
+        mock_to_thread.assert_not_called()
 
-        with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-            mock_session = MagicMock()
-            mock_post_cm = AsyncMock()
-            mock_post_cm.__aenter__.return_value = mock_response
-            mock_session.post.return_value = mock_post_cm
 
-            mock_session_cm = AsyncMock()
-            mock_session_cm.__aenter__.return_value = mock_session
-            mock_session_class.return_value = mock_session_cm
+class TestAttachmentCompression:
+    """Test opt-in gzip compression of code attachments."""
 
-            result = await handler.send_code_file(
-                recipient="+12345678900",
-                code=large_code,
-                filename="large.py"
-            )
+    @pytest.mark.asyncio
+    async def test_compress_sends_gzip_attachment(self, handler, signal_api, large_code):
+        """Compressible code goes out gzipped as <filename>.gz."""
+        result = await handler.send_code_file(
+            "+12345678900", large_code, "large.py", compress=True
+        )
+        [sent] = signal_api.requests
 
-            # Should handle large files
-            assert result == "123456789"
+        assert result == "123456789"
+        header, _, payload = sent["base64_attachments"][0].partition(",")
+        assert header == "data:application/gzip;filename=large.py.gz;base64"
+        raw = base64.b64decode(payload)
+        assert len(raw) < len(large_code) // 10
+        assert gzip.decompress(raw).decode("utf-8") == large_code
 
     @pytest.mark.asyncio
-    async def test_send_code_file_handles_special_chars_in_filename(self, handler, sample_code):
-        """Test that send_code_file handles filenames with special characters."""
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"timestamp": "123456789"})
+    async def test_compress_suffix_fits_filename_cap(self, handler, signal_api, large_code):
+        """A capped filename still ends in .gz within 255 characters."""
+        await handler.send_code_file(
+            "+12345678900", large_code, "a" * 300 + ".py", compress=True
+        )
+        [sent] = signal_api.requests
 
-        with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-            mock_session = MagicMock()
-            mock_post_cm = AsyncMock()
-            mock_post_cm.__aenter__.return_value = mock_response
-            mock_session.post.return_value = mock_post_cm
+        header = sent["base64_attachments"][0].partition(",")[0]
+        name = header.split(";filename=")[1].removesuffix(";base64")
+        assert len(name) == 255
+        assert name.endswith(".gz")
 
-            mock_session_cm = AsyncMock()
-            mock_session_cm.__aenter__.return_value = mock_session
-            mock_session_class.return_value = mock_session_cm
+    @pytest.mark.asyncio
+    async def test_compress_skips_small_code(self, handler, signal_api, sample_code):
+        """Code under COMPRESS_MIN_BYTES is sent as-is."""
+        await handler.send_code_file(
+            "+12345678900", sample_code, "test.py", compress=True
+        )
+        [sent] = signal_api.requests
 
-            result = await handler.send_code_file(
-                recipient="+12345678900",
-                code=sample_code,
-                filename="my-file_v2.0.py"
+        header, _, payload = sent["base64_attachments"][0].partition(",")
+        assert header == "data:text/x-python;filename=test.py;base64"
+        assert base64.b64decode(payload).decode("utf-8") == sample_code
+
+    def test_maybe_gzip_skips_incompressible_data(self):
+        """Data gzip can't shrink by 10% is returned unchanged."""
+        data = os.urandom(4096)
+
+        assert _maybe_gzip(data, min_bytes=1024) == (data, False)
+
+
+class TestUploadRetry:
+    """Test retrying uploads when the REST API can't be reached."""
+
+    @staticmethod
+    def refuse_connections(session, failures):
+        """Make the first `failures` session.post calls fail to connect."""
+        real_post = session.post
+        calls = []
+
+        def post(*args, **kwargs):
+            calls.append(args)
+            if len(calls) <= failures:
+                raise aiohttp.ClientConnectorError(
+                    MagicMock(), OSError("Connection refused")
+                )
+            return real_post(*args, **kwargs)
+
+        session.post = post
+        return calls
+
+    @pytest.mark.asyncio
+    async def test_retries_after_connection_failure(self, handler, signal_api, sample_code):
+        """A refused connection is retried with backoff and the upload succeeds."""
+        calls = self.refuse_connections(await handler._get_session(), failures=2)
+
+        with patch('src.signal.attachment_handler.asyncio.sleep',
+                   new_callable=AsyncMock) as mock_sleep:
+            result = await handler.send_code_file("+12345678900", sample_code, "test.py")
+
+        assert result == "123456789"
+        assert len(calls) == 3
+        assert len(signal_api.requests) == 1
+        assert [c.args[0] for c in mock_sleep.await_args_list] == [1.0, 2.0]
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_upload_attempts(self, handler, signal_api, sample_code):
+        """After UPLOAD_ATTEMPTS refused connections the upload returns None."""
+        calls = self.refuse_connections(await handler._get_session(), failures=99)
+
+        with patch('src.signal.attachment_handler.asyncio.sleep', new_callable=AsyncMock):
+            result = await handler.send_code_file("+12345678900", sample_code, "test.py")
+
+        assert result is None
+        assert len(calls) == AttachmentHandler.UPLOAD_ATTEMPTS
+        assert signal_api.requests == []
+
+    @pytest.mark.asyncio
+    async def test_api_error_not_retried(self, handler, signal_api, sample_code):
+        """An HTTP error reply may mean the message went out; don't resend."""
+        signal_api.respond(status=500, text="Server error")
+
+        result = await handler.send_code_file("+12345678900", sample_code, "test.py")
+
+        assert result is None
+        assert len(signal_api.requests) == 1
+
+
+class TestSendCodeFiles:
+    """Test batching several files into one Signal message."""
+
+    @pytest.mark.asyncio
+    async def test_batch_sent_in_single_post(self, handler, signal_api):
+        """Five files go out as five attachments of one /v2/send call."""
+        items = [(f"x = {i}\n", f"file{i}.py") for i in range(5)]
+        result = await handler.send_code_files("+12345678900", items)
+        [sent] = signal_api.requests
+
+        assert result == "123456789"
+        assert len(signal_api.requests) == 1
+        attachments = sent["base64_attachments"]
+        assert len(attachments) == 5
+        for (code, filename), attachment in zip(items, attachments):
+            header, _, payload = attachment.partition(",")
+            assert f"filename={filename}" in header
+            assert base64.b64decode(payload).decode("utf-8") == code
+            assert filename in sent["message"]
+
+    @pytest.mark.asyncio
+    async def test_batch_rejected_if_any_file_too_large(self, handler):
+        """One oversized file rejects the whole batch without uploading."""
+        items = [("ok", "small.py"), ("x" * (101 * 1024 * 1024), "huge.py")]
+
+        with patch.object(handler, '_upload_attachments', new_callable=AsyncMock) as mock_upload:
+            result = await handler.send_code_files("+12345678900", items)
+
+        assert result is None
+        mock_upload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_batch_rejected_if_total_too_large(self, handler, signal_api):
+        """Files each under the limit are rejected when their sum is over it."""
+        handler.MAX_SIZE_BYTES = 100
+        items = [("x" * 60, "a.py"), ("y" * 60, "b.py")]
+
+        result = await handler.send_code_files("+12345678900", items)
+
+        assert result is None
+        assert signal_api.requests == []
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_returns_none(self, handler):
+        """An empty batch sends nothing."""
+        assert await handler.send_code_files("+12345678900", []) is None
+
+
+class TestSendCodeFilesParallel:
+    """Test concurrent per-file uploads."""
+
+    @pytest.mark.asyncio
+    async def test_uploads_run_concurrently_up_to_limit(self, handler):
+        """At most `concurrency` uploads are in flight; results keep order."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_send(recipient, code, filename):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return None if filename == "bad.py" else f"ts-{filename}"
+
+        items = [("x", f"f{i}.py") for i in range(6)] + [("x", "bad.py")]
+
+        with patch.object(handler, 'send_code_file', side_effect=fake_send):
+            results = await handler.send_code_files_parallel(
+                "+12345678900", items, concurrency=3
             )
 
-            # Should handle special chars
-            assert result == "123456789"
+        assert peak == 3
+        assert results == [f"ts-f{i}.py" for i in range(6)] + [None]
+
+    @pytest.mark.asyncio
+    async def test_batch_fills_every_upload_slot(self, signal_api, sample_code):
+        """8 uploads with 4 slots run four at a time, not one after another."""
+        handler = AttachmentHandler(signal_api.url, max_concurrent_uploads=4)
+        in_flight = 0
+        peak = 0
+
+        async def slow_post(*args):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "123456789"
+
+        items = [(sample_code, f"f{i}.py") for i in range(8)]
+
+        with patch.object(handler, '_post_send_body', side_effect=slow_post) as mock_post:
+            results = await handler.send_code_files_parallel("+12345678900", items)
+
+        await handler.aclose()
+        assert mock_post.call_count == len(items)
+        assert results == ["123456789"] * len(items)
+        assert peak == 4
+
+
+class TestUploadConcurrency:
+    """Test the handler-wide cap on in-flight uploads."""
+
+    @pytest.mark.asyncio
+    async def test_semaphore_limits_concurrent_uploads(self, signal_api, sample_code):
+        """20 simultaneous sends never have more than max_concurrent_uploads POSTs open."""
+        handler = AttachmentHandler(signal_api.url, max_concurrent_uploads=4)
+        release = asyncio.Event()
+        in_flight = 0
+        peak = 0
+
+        async def slow_post(*args):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await release.wait()
+            in_flight -= 1
+            return "123456789"
+
+        with patch.object(handler, '_post_send_body', side_effect=slow_post):
+            sends = asyncio.gather(*(
+                handler.send_code_file("+12345678900", sample_code, f"f{i}.py")
+                for i in range(20)
+            ))
+            for _ in range(10):
+                await asyncio.sleep(0)
+            assert in_flight == 4
+
+            release.set()
+            results = await sends
+
+        await handler.aclose()
+        assert peak == 4
+        assert results == ["123456789"] * 20
+
+
+class TestSendFile:
+    """Test sending an existing file from disk."""
+
+    @pytest.mark.asyncio
+    async def test_send_file_streams_file_content(self, handler, signal_api, tmp_path):
+        """send_file uploads the file's bytes under its basename."""
+        path = tmp_path / "notes.md"
+        path.write_bytes(b"# Notes\n")
+        result = await handler.send_file("+12345678900", str(path))
+        [sent] = signal_api.requests
+
+        assert result == "123456789"
+        assert "notes.md" in sent["message"]
+        payload = sent["base64_attachments"][0].partition(",")[2]
+        assert base64.b64decode(payload) == b"# Notes\n"
+
+    @pytest.mark.asyncio
+    async def test_send_file_missing_path_returns_none(self, handler, tmp_path):
+        """send_file returns None when the file can't be read."""
+        result = await handler.send_file("+12345678900", str(tmp_path / "missing.py"))
+
+        assert result is None
 
 
 class TestAttachmentValidation:
     """Test attachment size limits and validation."""
 
     @pytest.mark.asyncio
-    async def test_rejects_files_over_100mb(self):
+    async def test_rejects_files_over_100mb(self, handler):
         """Test that files over 100MB are rejected."""
-        handler = AttachmentHandler(signal_api_url="http://localhost:8080")
-
         # Create code larger than 100MB
         large_code = "x" * (101 * 1024 * 1024)
 
@@ -356,115 +580,123 @@ class TestAttachmentValidation:
         assert result is None
 
     @pytest.mark.asyncio
-    async def test_warns_for_files_over_10mb(self, capsys):
-        """Test that files over 10MB trigger a warning."""
-        handler = AttachmentHandler(signal_api_url="http://localhost:8080")
+    async def test_reject_path_does_not_encode(self, handler):
+        """Oversized code is rejected before UTF-8 or base64 encoding."""
+        large_code = "x" * (101 * 1024 * 1024)
+
+        with patch.object(handler, '_encode_code', new_callable=AsyncMock) as mock_encode, \
+                patch('src.signal.attachment_handler.binascii.b2a_base64') as mock_b64:
+            result = await handler.send_code_file("+12345678900", large_code, "huge.py")
+            batch = await handler.send_code_files("+12345678900", [(large_code, "huge.py")])
 
+        assert result is None
+        assert batch is None
+        mock_encode.assert_not_called()
+        mock_b64.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_warns_for_files_over_10mb(self, handler, signal_api, capsys):
+        """Test that files over 10MB trigger a warning."""
         # Create code larger than 10MB but under 100MB
         large_code = "x" * (11 * 1024 * 1024)
+        signal_api.respond(payload={"timestamp": "123456789"})
 
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"timestamp": "123456789"})
+        result = await handler.send_code_file(
+            recipient="+12345678900",
+            code=large_code,
+            filename="large.py"
+        )
 
-        with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-            mock_session = MagicMock()
-            mock_post_cm = AsyncMock()
-            mock_post_cm.__aenter__.return_value = mock_response
-            mock_session.post.return_value = mock_post_cm
+        # Should still upload
+        assert result == "123456789"
 
-            mock_session_cm = AsyncMock()
-            mock_session_cm.__aenter__.return_value = mock_session
-            mock_session_class.return_value = mock_session_cm
+        # Should have logged warning (captured by structlog)
+        captured = capsys.readouterr()
+        assert "large" in captured.out.lower() or "warning" in captured.out.lower()
 
-            result = await handler.send_code_file(
-                recipient="+12345678900",
-                code=large_code,
-                filename="large.py"
-            )
+    @pytest.mark.asyncio
+    async def test_sanitizes_filename_with_special_chars(self, handler, signal_api):
+        """Test that filenames with special characters are sanitized."""
+        result = await handler.send_code_file(
+            recipient="+12345678900",
+            code="test",
+            filename="../../../etc/passwd"  # Path traversal attempt
+        )
+        [sent] = signal_api.requests
 
-            # Should still upload
-            assert result == "123456789"
+        # Should still upload (with sanitized filename)
+        assert result == "123456789"
 
-            # Should have logged warning (captured by structlog)
-            captured = capsys.readouterr()
-            assert "large" in captured.out.lower() or "warning" in captured.out.lower()
+        # Verify sanitized filename was used
+        message = sent.get('message', '')
+        # Should not contain path traversal
+        assert "../" not in message
 
     @pytest.mark.asyncio
-    async def test_sanitizes_filename_with_special_chars(self):
-        """Test that filenames with special characters are sanitized."""
-        handler = AttachmentHandler(signal_api_url="http://localhost:8080")
+    async def test_sanitizes_filename_removes_invalid_chars(self, handler, signal_api):
+        """Test that invalid filename characters are replaced."""
+        signal_api.respond(payload={"timestamp": "123456789"})
 
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"timestamp": "123456789"})
+        result = await handler.send_code_file(
+            recipient="+12345678900",
+            code="test",
+            filename='bad<>:"|?*chars.py'
+        )
 
-        with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-            mock_session = MagicMock()
-            mock_post_cm = AsyncMock()
-            mock_post_cm.__aenter__.return_value = mock_response
-            mock_session.post.return_value = mock_post_cm
+        # Should upload with sanitized filename
+        assert result == "123456789"
+
+    @pytest.mark.parametrize("filename, expected", [
+        ("user.py", "user.py"),
+        ('bad<>:"|?*chars.py', "bad_______chars.py"),
+        ("dir/sub\\name.py", "sub_name.py"),
+        ("../../../etc/passwd", "passwd"),
+        ("", "code.txt"),
+        ("line\nbreak\t.py", "line_break_.py"),
+        ("a,b;base64,.py", "a_b_base64_.py"),
+        ("a" * 300 + ".py", "a" * 252 + ".py"),
+    ])
+    def test_sanitize_filename(self, filename, expected):
+        """Invalid characters become underscores; directories are dropped."""
+        handler = AttachmentHandler(signal_api_url="http://localhost:8080")
 
-            mock_session_cm = AsyncMock()
-            mock_session_cm.__aenter__.return_value = mock_session
-            mock_session_class.return_value = mock_session_cm
+        assert handler._sanitize_filename(filename) == expected
 
-            result = await handler.send_code_file(
-                recipient="+12345678900",
-                code="test",
-                filename="../../../etc/passwd"  # Path traversal attempt
-            )
+    def test_sanitize_filename_is_cached(self, handler):
+        """Repeated names are served from the sanitizer cache."""
+        _sanitize_filename.cache_clear()
 
-            # Should still upload (with sanitized filename)
-            assert result == "123456789"
+        for _ in range(3):
+            assert handler._sanitize_filename("dir/cached.py") == "cached.py"
 
-            # Verify sanitized filename was used
-            call_args = mock_session.post.call_args
-            json_data = call_args[1]['json']
-            message = json_data.get('message', '')
-            # Should not contain path traversal
-            assert "../" not in message
+        assert _sanitize_filename.cache_info().hits == 2
 
     @pytest.mark.asyncio
-    async def test_sanitizes_filename_removes_invalid_chars(self):
-        """Test that invalid filename characters are replaced."""
-        handler = AttachmentHandler(signal_api_url="http://localhost:8080")
-
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"timestamp": "123456789"})
+    async def test_data_uri_prefix_is_cached(self, handler, signal_api):
+        """Sending the same filename again reuses its data URI prefix."""
+        _data_uri_prefix.cache_clear()
 
-        with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-            mock_session = MagicMock()
-            mock_post_cm = AsyncMock()
-            mock_post_cm.__aenter__.return_value = mock_response
-            mock_session.post.return_value = mock_post_cm
+        await handler.send_code_file("+12345678900", "x = 1", "log.py")
+        await handler.send_code_file("+12345678900", "x = 2", "log.py")
 
-            mock_session_cm = AsyncMock()
-            mock_session_cm.__aenter__.return_value = mock_session
-            mock_session_class.return_value = mock_session_cm
-
-            result = await handler.send_code_file(
-                recipient="+12345678900",
-                code="test",
-                filename='bad<>:"|?*chars.py'
+        assert _data_uri_prefix.cache_info().hits == 1
+        for sent in signal_api.requests:
+            assert sent["base64_attachments"][0].startswith(
+                "data:text/x-python;filename=log.py;base64,"
             )
 
-            # Should upload with sanitized filename
-            assert result == "123456789"
-
     @pytest.mark.asyncio
-    async def test_validates_recipient_phone_number(self):
+    async def test_validates_recipient_phone_number(self, handler):
         """Test that invalid recipient phone numbers are rejected."""
-        handler = AttachmentHandler(signal_api_url="http://localhost:8080")
-
         # Invalid phone numbers (not E.164 format)
         invalid_phones = [
             "12345678900",  # Missing +
             "+1",  # Too short
             "+123456789012345678",  # Too long
             "invalid",  # Not a number
-            ""  # Empty
+            "",  # Empty
+            "+12345678900\n",  # Trailing newline
+            "+１２３４５６７８９００",  # Non-ASCII digits
         ]
 
         for invalid_phone in invalid_phones:
@@ -477,71 +709,80 @@ class TestAttachmentValidation:
             assert result is None, f"Should reject phone: {invalid_phone}"
 
     @pytest.mark.asyncio
-    async def test_accepts_valid_e164_phone_numbers(self):
+    async def test_accepts_valid_e164_phone_numbers(self, handler, signal_api):
         """Test that valid E.164 phone numbers are accepted."""
-        handler = AttachmentHandler(signal_api_url="http://localhost:8080")
+        signal_api.respond(payload={"timestamp": "123456789"})
 
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"timestamp": "123456789"})
-
-        with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-            mock_session = MagicMock()
-            mock_post_cm = AsyncMock()
-            mock_post_cm.__aenter__.return_value = mock_response
-            mock_session.post.return_value = mock_post_cm
-
-            mock_session_cm = AsyncMock()
-            mock_session_cm.__aenter__.return_value = mock_session
-            mock_session_class.return_value = mock_session_cm
-
-            # Valid E.164 phone numbers
-            valid_phones = [
-                "+12345678900",  # US
-                "+447911123456",  # UK
-                "+861234567890"  # China
-            ]
-
-            for valid_phone in valid_phones:
-                result = await handler.send_code_file(
-                    recipient=valid_phone,
-                    code="test",
-                    filename="test.py"
-                )
-                # Should accept valid phone
-                assert result == "123456789", f"Should accept phone: {valid_phone}"
+        # Valid E.164 phone numbers
+        valid_phones = [
+            "+12345678900",  # US
+            "+447911123456",  # UK
+            "+861234567890"  # China
+        ]
+
+        for valid_phone in valid_phones:
+            result = await handler.send_code_file(
+                recipient=valid_phone,
+                code="test",
+                filename="test.py"
+            )
+            # Should accept valid phone
+            assert result == "123456789", f"Should accept phone: {valid_phone}"
 
     @pytest.mark.asyncio
-    async def test_handles_empty_filename(self):
+    async def test_handles_empty_filename(self, handler, signal_api):
         """Test that empty filenames are replaced with default."""
-        handler = AttachmentHandler(signal_api_url="http://localhost:8080")
+        result = await handler.send_code_file(
+            recipient="+12345678900",
+            code="test",
+            filename=""  # Empty filename
+        )
+        [sent] = signal_api.requests
 
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={"timestamp": "123456789"})
+        # Should upload with default filename
+        assert result == "123456789"
 
-        with patch('src.signal.attachment_handler.aiohttp.ClientSession') as mock_session_class:
-            mock_session = MagicMock()
-            mock_post_cm = AsyncMock()
-            mock_post_cm.__aenter__.return_value = mock_response
-            mock_session.post.return_value = mock_post_cm
+        # Verify default filename was used
+        message = sent.get('message', '')
+        # Should have some default name
+        assert len(message) > 2  # More than just emoji
 
-            mock_session_cm = AsyncMock()
-            mock_session_cm.__aenter__.return_value = mock_session
-            mock_session_class.return_value = mock_session_cm
 
-            result = await handler.send_code_file(
-                recipient="+12345678900",
-                code="test",
-                filename=""  # Empty filename
-            )
+class TestAttachmentSession:
+    """Test the shared upload session lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_session_reused_across_uploads(self, handler, signal_api, sample_code):
+        """Consecutive uploads share one ClientSession."""
+        signal_api.respond(payload={"timestamp": "123456789"})
+
+        await handler.send_code_file("+12345678900", sample_code, "a.py")
+        session = handler._session
+        await handler.send_code_file("+12345678900", sample_code, "b.py")
+
+        assert session is not None
+        assert handler._session is session
+        assert len(signal_api.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_send_url_tolerates_trailing_slash(self, signal_api, sample_code):
+        """A base URL ending in "/" still posts to <base>/v2/send."""
+        handler = AttachmentHandler(signal_api_url=signal_api.url + "/")
+
+        result = await handler.send_code_file("+12345678900", sample_code, "a.py")
+        await handler.aclose()
+
+        assert handler._send_url == f"{signal_api.url}/v2/send"
+        assert result == "123456789"
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_and_resets_session(self, handler):
+        """aclose() closes the shared session; the next use opens a new one."""
+        session = await handler._get_session()
 
-            # Should upload with default filename
-            assert result == "123456789"
+        await handler.aclose()
 
-            # Verify default filename was used
-            call_args = mock_session.post.call_args
-            json_data = call_args[1]['json']
-            message = json_data.get('message', '')
-            # Should have some default name
-            assert len(message) > 2  # More than just emoji
+        assert session.closed
+        assert handler._session is None
+        # Closing twice is a no-op
+        await handler.aclose()
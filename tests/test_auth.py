@@ -6,12 +6,12 @@ from pathlib import Path
 
 import pytest
 
-from src.auth.phone_verifier import PhoneVerifier
+from src.auth.phone_verifier import PhoneVerifier, _read_authorized_number
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def temp_config():
-    """Create a temporary config file for testing."""
+    """Create a temporary config file, shared by this module's tests (read-only)."""
     with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
         config = {
             "authorized_number": "+1234567890",
@@ -26,9 +26,9 @@ def temp_config():
     Path(config_path).unlink(missing_ok=True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def verifier(temp_config):
-    """Create PhoneVerifier with temporary config."""
+    """Create PhoneVerifier with temporary config (verify() is stateless)."""
     return PhoneVerifier(config_path=temp_config)
 
 
@@ -112,6 +112,55 @@ def test_empty_authorized_number_raises_error():
         Path(config_path).unlink(missing_ok=True)
 
 
+def test_authorized_number_whitespace_stripped_on_load():
+    """Test that whitespace around the configured number is ignored."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+        json.dump({"authorized_number": " +1234567890\n"}, f)
+        config_path = f.name
+
+    try:
+        verifier = PhoneVerifier(config_path=config_path)
+        assert verifier.authorized_number == "+1234567890"
+        assert verifier.verify("+1234567890") is True
+    finally:
+        Path(config_path).unlink(missing_ok=True)
+
+
+def test_whitespace_only_authorized_number_raises_error():
+    """Test that a whitespace-only authorized_number raises ValueError."""
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+        json.dump({"authorized_number": "   "}, f)
+        config_path = f.name
+
+    try:
+        with pytest.raises(ValueError, match="must be a non-empty string"):
+            PhoneVerifier(config_path=config_path)
+    finally:
+        Path(config_path).unlink(missing_ok=True)
+
+
+def test_config_parse_shared_across_verifiers(temp_config):
+    """Test that verifiers built from an unchanged config reuse one parse."""
+    _read_authorized_number.cache_clear()
+
+    PhoneVerifier(config_path=temp_config)
+    PhoneVerifier(config_path=temp_config)
+
+    info = _read_authorized_number.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+def test_edited_config_is_reread(tmp_path):
+    """Test that a changed config file is parsed again, not served from cache."""
+    config_path = tmp_path / "daemon.json"
+    config_path.write_text(json.dumps({"authorized_number": "+1234567890"}))
+    assert PhoneVerifier(config_path=str(config_path)).authorized_number == "+1234567890"
+
+    config_path.write_text(json.dumps({"authorized_number": "+10987654321"}))
+
+    assert PhoneVerifier(config_path=str(config_path)).authorized_number == "+10987654321"
+
+
 def test_partial_match_returns_false(verifier):
     """Test that partial phone number match returns False (exact match required)."""
     assert verifier.verify("+123456789") is False  # Missing one digit
@@ -29,6 +29,41 @@ async def test_send_command():
     mock_stdin.drain.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_send_commands_single_drain():
+    """Test a batch of commands goes out in one write and one drain."""
+    mock_process = MagicMock()
+    mock_stdin = AsyncMock()
+    mock_process.stdin = mock_stdin
+    mock_process.returncode = None
+
+    mock_stdin.write = MagicMock()  # StreamWriter.write is synchronous
+
+    bridge = CLIBridge(mock_process)
+
+    await bridge.send_commands(f"command {i}" for i in range(5))
+
+    mock_stdin.write.assert_called_once_with(
+        b"command 0\ncommand 1\ncommand 2\ncommand 3\ncommand 4\n"
+    )
+    assert mock_stdin.drain.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_send_commands_empty_batch_writes_nothing():
+    """Test an empty batch neither writes nor drains."""
+    mock_process = MagicMock()
+    mock_stdin = AsyncMock()
+    mock_process.stdin = mock_stdin
+
+    bridge = CLIBridge(mock_process)
+
+    await bridge.send_commands([])
+
+    mock_stdin.write.assert_not_called()
+    mock_stdin.drain.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_read_response():
     """Test reading response from Claude Code CLI stdout."""
@@ -38,11 +73,10 @@ async def test_read_response():
     mock_process.stdout = mock_stdout
     mock_process.returncode = None
 
-    # Mock readline to return response lines then empty
-    mock_stdout.readline.side_effect = [
-        b"Response line 1\n",
-        b"Response line 2\n",
-        b"",  # Empty means EOF or prompt
+    # Mock read to return both lines in one chunk, then EOF
+    mock_stdout.read.side_effect = [
+        b"Response line 1\nResponse line 2\n",
+        b"",  # Empty means EOF
     ]
 
     bridge = CLIBridge(mock_process)
@@ -78,6 +112,20 @@ async def test_is_connected_when_stopped():
     assert bridge.is_connected is False
 
 
+@pytest.mark.asyncio
+async def test_is_connected_caches_dead_state():
+    """Test is_connected stays False once the process has been seen exited."""
+    mock_process = MagicMock()
+    mock_process.returncode = 0  # Exited
+
+    bridge = CLIBridge(mock_process)
+
+    assert bridge.is_connected is False
+
+    mock_process.returncode = None
+    assert bridge.is_connected is False
+
+
 @pytest.mark.asyncio
 async def test_send_command_encodes_utf8():
     """Test send_command properly encodes UTF-8 characters."""
@@ -104,9 +152,9 @@ async def test_read_response_decodes_utf8():
     mock_process.stdout = mock_stdout
     mock_process.returncode = None
 
-    # Mock readline with UTF-8 encoded response
+    # Mock read with UTF-8 encoded response
     response = "Response with émojis 🎉\n".encode('utf-8')
-    mock_stdout.readline.side_effect = [response, b""]
+    mock_stdout.read.side_effect = [response, b""]
 
     bridge = CLIBridge(mock_process)
 
@@ -115,3 +163,44 @@ async def test_read_response_decodes_utf8():
         lines.append(line)
 
     assert lines == ["Response with émojis 🎉"]
+
+
+@pytest.mark.asyncio
+async def test_read_response_joins_lines_split_across_reads():
+    """Test lines and multi-byte characters cut between reads are reassembled."""
+    mock_process = MagicMock()
+    mock_stdout = AsyncMock()
+    mock_process.stdout = mock_stdout
+    mock_process.returncode = None
+
+    data = "first\nsecond 🎉 line\n\nunterminated".encode('utf-8')
+    cut = data.index("🎉".encode('utf-8')) + 2  # Inside the emoji
+    mock_stdout.read.side_effect = [data[:3], data[3:cut], data[cut:], b""]
+
+    bridge = CLIBridge(mock_process)
+
+    lines = [line async for line in bridge.read_response()]
+
+    assert lines == ["first", "second 🎉 line", "", "unterminated"]
+    mock_stdout.readline.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_read_response_keeps_unread_lines_for_next_call():
+    """Test lines buffered past an early stop are yielded by the next call."""
+    mock_process = MagicMock()
+    mock_stdout = AsyncMock()
+    mock_process.stdout = mock_stdout
+    mock_process.returncode = None
+
+    mock_stdout.read.side_effect = [b"one\ntwo\nthree\n", b""]
+
+    bridge = CLIBridge(mock_process)
+
+    async for line in bridge.read_response():
+        assert line == "one"
+        break
+
+    lines = [line async for line in bridge.read_response()]
+
+    assert lines == ["two", "three"]
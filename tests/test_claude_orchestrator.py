@@ -1,165 +1,274 @@
 """Tests for ClaudeOrchestrator - end-to-end command flow."""
 
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
 import pytest
-from unittest.mock import AsyncMock, Mock, MagicMock, call, patch
+from unittest.mock import call
 from src.claude.orchestrator import ClaudeOrchestrator
-from src.claude.parser import OutputParser, OutputType, ToolCall, Progress, Error, Response
+from src.claude.parser import OutputParser, OutputType, Response
 from src.claude.responder import SignalResponder
 
 
-@pytest.mark.asyncio
-async def test_execute_command():
-    """Test basic command execution flow."""
-    # Arrange
-    bridge = Mock()
-    parser = OutputParser()
-    responder = SignalResponder()
-    send_signal = AsyncMock()
+# All tests share one event loop; they only await mocks, so per-test loop
+# setup and teardown would dominate their run time.
+pytestmark = pytest.mark.asyncio(loop_scope="module")
 
-    # Mock bridge to return simple response
-    async def mock_read_response():
-        yield "Analyzing your request..."
-        yield "Using Read tool on file.py"
-        yield "Here's the analysis"
+# Read, Grep, Write and Bash tool emoji
+TOOL_EMOJI = frozenset("📖🔍💾🔧")
 
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
 
-    orchestrator = ClaudeOrchestrator(bridge, parser, responder, send_signal)
+def any_contains(send_signal, *needles, ignore_case=False):
+    """Whether any sent message contains any needle; stops at the first hit.
 
-    # Act
-    await orchestrator.execute_command("help me debug", "session-123", "+1234567890")
+    With ignore_case, messages are lowercased before the (lowercase) needles
+    are searched for.
+    """
+    for c in send_signal.call_args_list:
+        message = c.args[1].lower() if ignore_case else c.args[1]
+        if any(needle in message for needle in needles):
+            return True
+    return False
 
-    # Assert
-    bridge.send_command.assert_called_once_with("help me debug")
 
-    # Verify messages were sent to Signal
-    assert send_signal.call_count >= 1
+def missing_from(send_signal, needles):
+    """Needles not found in any sent message, in one pass over the messages."""
+    remaining = set(needles)
+    for c in send_signal.call_args_list:
+        if not remaining:
+            break
+        remaining = {needle for needle in remaining if needle not in c.args[1]}
+    return remaining
 
-    # Verify at least one message was sent
-    calls = send_signal.call_args_list
-    messages = [call[0][1] for call in calls]  # Extract message text
 
-    # Should contain formatted output
-    assert any("📖" in msg for msg in messages)  # Tool call emoji
+@pytest.fixture(scope="module")
+def parser():
+    """OutputParser shared by the module (parse() keeps no state)."""
+    return OutputParser()
 
 
-@pytest.mark.asyncio
-async def test_stream_output():
-    """Test streaming output with batching."""
-    # Arrange
-    bridge = Mock()
-    parser = OutputParser()
-    responder = SignalResponder()
-    send_signal = AsyncMock()
-
-    # Mock multiple lines of output
-    async def mock_read_response():
-        yield "Analyzing code..."
-        yield "Using Read tool on src/main.py"
-        yield "Using Edit tool on src/main.py"
-        yield "Writing changes..."
-        yield "Done!"
-
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
+@pytest.fixture(scope="session")
+def long_code():
+    """150 lines of code, enough to trigger the attachment path."""
+    return "\n".join(f"line {i}: print('test')" for i in range(150))
 
-    orchestrator = ClaudeOrchestrator(bridge, parser, responder, send_signal)
 
-    # Act
-    await orchestrator.execute_command("fix the bug", "session-456", "+1234567890")
+@pytest.fixture(scope="module")
+def responder():
+    """SignalResponder shared by the module (format() keeps no state)."""
+    return SignalResponder()
 
-    # Assert
-    assert send_signal.call_count >= 1
 
-    # Verify tool calls were formatted
-    calls = send_signal.call_args_list
-    messages = [call[0][1] for call in calls]
-    combined = "\n".join(messages)
+class AsyncListIter:
+    """Async iterator over a fixed list, without async-generator machinery.
 
-    assert "📖" in combined  # Read tool
-    assert "✏️" in combined  # Edit tool
+    An exception instance in the list is raised when iteration reaches it.
+    """
 
+    __slots__ = ("_items", "_index")
 
-@pytest.mark.asyncio
-async def test_handle_error():
-    """Test error handling in command execution."""
-    # Arrange
-    bridge = Mock()
-    parser = OutputParser()
-    responder = SignalResponder()
-    send_signal = AsyncMock()
+    def __init__(self, items):
+        self._items = items
+        self._index = 0
 
-    # Mock error output
-    async def mock_read_response():
-        yield "Analyzing..."
-        yield "Error: File not found: missing.py"
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._index >= len(self._items):
+            raise StopAsyncIteration
+        item = self._items[self._index]
+        self._index += 1
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+
+@dataclass(slots=True)
+class StubParser:
+    """Parser returning one canned result for every line."""
+
+    result: Any
+    calls: int = 0
 
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
+    def parse(self, line):
+        self.calls += 1
+        return self.result
+
+
+@dataclass(slots=True)
+class StubResponder:
+    """Responder returning a canned format() result and recording uploads."""
+
+    formatted: str
+    attached: Optional[str] = None
+    attachment_calls: list = field(default_factory=list)
+
+    def format(self, parsed):
+        return self.formatted
+
+    async def send_with_attachments(self, message, code_blocks, recipient):
+        self.attachment_calls.append((message, code_blocks, recipient))
+        return self.attached
+
+
+class RecordingAsyncCall:
+    """Async callable that records its calls, a lightweight AsyncMock stand-in.
+
+    call_args_list holds unittest.mock.call objects, so assertions read the
+    same as against an AsyncMock. A side_effect exception is raised after
+    recording; otherwise return_value is returned.
+    """
+
+    __slots__ = ("call_args_list", "side_effect", "return_value")
+
+    def __init__(self, side_effect=None, return_value=None):
+        self.call_args_list = []
+        self.side_effect = side_effect
+        self.return_value = return_value
+
+    @property
+    def call_count(self):
+        return len(self.call_args_list)
+
+    async def __call__(self, *args, **kwargs):
+        self.call_args_list.append(call(*args, **kwargs))
+        if self.side_effect is not None:
+            raise self.side_effect
+        return self.return_value
+
+
+@dataclass(slots=True)
+class StubDetector:
+    """ApprovalDetector stand-in classifying every tool call as destructive."""
+
+    reason: str
+
+    def classify(self, parsed):
+        return False, self.reason
+
+
+@dataclass(slots=True)
+class StubApprovalWorkflow:
+    """ApprovalWorkflow stand-in that requires approval for every tool call."""
+
+    wait_for_approval: Callable[..., Awaitable[bool]]
+    detector: StubDetector
+    request_id: str = "approval-123"
+    message: str = "Approval required"
+
+    def intercept(self, parsed):
+        return False, self.request_id
+
+    def format_approval_message(self, parsed, reason, request_id):
+        return self.message
+
+
+class StubNotificationManager:
+    """NotificationManager stand-in recording notify() calls."""
+
+    __slots__ = ("notify",)
+
+    def __init__(self):
+        self.notify = RecordingAsyncCall()
+
+
+class StubBridge:
+    """CLIBridge stand-in: records commands and replays the given output lines."""
+
+    __slots__ = ("send_command", "_lines")
+
+    def __init__(self, lines=()):
+        self.send_command = RecordingAsyncCall()
+        self._lines = lines
+
+    def read_response(self):
+        return AsyncListIter(self._lines)
+
+
+@pytest.mark.parametrize(
+    "command,response_lines,expected_emoji",
+    [
+        (
+            "help me debug",
+            ["Analyzing your request...", "Using Read tool on file.py", "Here's the analysis"],
+            ("📖",),
+        ),
+        (
+            "fix the bug",
+            [
+                "Analyzing code...",
+                "Using Read tool on src/main.py",
+                "Using Edit tool on src/main.py",
+                "Writing changes...",
+                "Done!",
+            ],
+            ("📖", "✏️"),
+        ),
+        (
+            "run tests",
+            [
+                "Using Read tool on config.py",
+                "Using Grep tool on *.py",
+                "Using Write tool on output.txt",
+                "Running: pytest tests/",
+                "All tests passed!",
+            ],
+            TOOL_EMOJI,
+        ),
+    ],
+    ids=["single_tool", "stream_output", "multiple_tools"],
+)
+async def test_tool_emojis(parser, responder, command, response_lines, expected_emoji):
+    """Test command output streams to Signal with each tool call's emoji."""
+    # Arrange
+    send_signal = RecordingAsyncCall()
+    bridge = StubBridge(response_lines)
 
     orchestrator = ClaudeOrchestrator(bridge, parser, responder, send_signal)
 
     # Act
-    await orchestrator.execute_command("read missing.py", "session-789", "+1234567890")
+    await orchestrator.execute_command(command, "session-123", "+1234567890")
 
     # Assert
-    calls = send_signal.call_args_list
-    messages = [call[0][1] for call in calls]
-    combined = "\n".join(messages)
+    assert bridge.send_command.call_args_list == [call(command)]
+    # The whole stream arrives within one batch interval: one Signal send
+    assert send_signal.call_count == 1
 
-    # Should contain error formatting
-    assert "❌" in combined or "Error" in combined
+    assert not missing_from(send_signal, expected_emoji)
 
 
-@pytest.mark.asyncio
-async def test_command_with_tool_calls():
-    """Test command that makes multiple tool calls."""
+async def test_handle_error(parser, responder):
+    """Test error handling in command execution."""
     # Arrange
-    bridge = Mock()
-    parser = OutputParser()
-    responder = SignalResponder()
-    send_signal = AsyncMock()
-
-    # Mock output with multiple tools
-    async def mock_read_response():
-        yield "Using Read tool on config.py"
-        yield "Using Grep tool on *.py"
-        yield "Using Write tool on output.txt"
-        yield "Running: pytest tests/"
-        yield "All tests passed!"
-
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
+    send_signal = RecordingAsyncCall()
+
+    # Mock error output
+    response_lines = [
+        "Analyzing...",
+        "Error: File not found: missing.py",
+    ]
+
+    bridge = StubBridge(response_lines)
 
     orchestrator = ClaudeOrchestrator(bridge, parser, responder, send_signal)
 
     # Act
-    await orchestrator.execute_command("run tests", "session-abc", "+1234567890")
+    await orchestrator.execute_command("read missing.py", "session-789", "+1234567890")
 
     # Assert
-    calls = send_signal.call_args_list
-    messages = [call[0][1] for call in calls]
-    combined = "\n".join(messages)
-
-    # Verify all tool emojis present
-    assert "📖" in combined  # Read
-    assert "🔍" in combined  # Grep
-    assert "💾" in combined  # Write
-    assert "🔧" in combined  # Bash
+    # Should contain error formatting
+    assert any_contains(send_signal, "❌", "Error")
 
 
-@pytest.mark.asyncio
-async def test_bridge_exception_handling():
+async def test_bridge_exception_handling(parser, responder):
     """Test handling of CLIBridge exceptions."""
     # Arrange
-    bridge = Mock()
-    parser = OutputParser()
-    responder = SignalResponder()
-    send_signal = AsyncMock()
+    send_signal = RecordingAsyncCall()
 
     # Mock bridge to raise exception
-    bridge.send_command = AsyncMock(side_effect=ValueError("stdin not available"))
+    bridge = StubBridge()
+    bridge.send_command.side_effect = ValueError("stdin not available")
 
     orchestrator = ClaudeOrchestrator(bridge, parser, responder, send_signal)
 
@@ -168,46 +277,30 @@ async def test_bridge_exception_handling():
 
     # Assert - should send error message to Signal
     assert send_signal.call_count >= 1
-    calls = send_signal.call_args_list
-    messages = [call[0][1] for call in calls]
-    combined = "\n".join(messages)
-
     # Should contain error about bridge failure
-    assert "error" in combined.lower() or "❌" in combined
+    assert any_contains(send_signal, "error", "❌", ignore_case=True)
 
 
-@pytest.mark.asyncio
-async def test_execute_command_with_long_code_attachment():
+async def test_execute_command_with_long_code_attachment(long_code):
     """Test attachment upload when marker detected in formatted output."""
     # Arrange
-    bridge = Mock()
-    parser = Mock()
-    responder = Mock()
-    send_signal = AsyncMock()
-
-    # Generate 150 lines of code content
-    long_code = "\n".join([f"line {i}: print('test')" for i in range(150)])
+    send_signal = RecordingAsyncCall()
 
-    # Create a Response object with text attribute
-    mock_response = Response(type=OutputType.RESPONSE, text=long_code)
+    # Parser returns a Response carrying the code text
+    parser = StubParser(Response(type=OutputType.RESPONSE, text=long_code))
 
-    # Mock parser.parse() to return Response
-    parser.parse.return_value = mock_response
-
-    # Mock responder.format() to return message with attachment marker
+    # format() returns a message with the attachment marker, and
+    # send_with_attachments() returns the updated message
     formatted_message = f"Here's the output:\n[Code too long (150 lines) - attachment coming...]\n{long_code}"
-    responder.format.return_value = formatted_message
-
-    # Mock responder.send_with_attachments() to return updated message
     updated_message = "Here's the output:\n[Code attached as output_20260127_123456.txt]"
-    responder.send_with_attachments = AsyncMock(return_value=updated_message)
+    responder = StubResponder(formatted_message, attached=updated_message)
 
     # Mock bridge response
-    async def mock_read_response():
-        yield "Here's the code output"
+    response_lines = [
+        "Here's the code output",
+    ]
 
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
+    bridge = StubBridge(response_lines)
 
     orchestrator = ClaudeOrchestrator(bridge, parser, responder, send_signal)
 
@@ -216,13 +309,7 @@ async def test_execute_command_with_long_code_attachment():
 
     # Assert
     # Verify send_with_attachments was called once
-    responder.send_with_attachments.assert_called_once()
-
-    # Extract call arguments
-    call_args = responder.send_with_attachments.call_args
-    actual_message = call_args[0][0]
-    actual_attachments = call_args[0][1]
-    actual_recipient = call_args[0][2]
+    [(actual_message, actual_attachments, actual_recipient)] = responder.attachment_calls
 
     # Verify message content
     assert actual_message == formatted_message
@@ -237,41 +324,30 @@ async def test_execute_command_with_long_code_attachment():
     assert actual_recipient == "+1234567890"
 
     # Verify send_signal was called with updated message (marker replaced)
-    send_signal.assert_called()
-    final_call = send_signal.call_args_list[-1]
-    final_message = final_call[0][1]
+    assert send_signal.call_count >= 1
+    final_message = send_signal.call_args_list[-1].args[1]
     assert "[Code attached as" in final_message or "output_" in final_message
 
 
-@pytest.mark.asyncio
 async def test_execute_command_without_attachment_markers():
     """Test no-op when no attachment markers present in formatted output."""
     # Arrange
-    bridge = Mock()
-    parser = Mock()
-    responder = Mock()
-    send_signal = AsyncMock()
+    send_signal = RecordingAsyncCall()
 
-    # Create a Response object with text attribute
+    # Parser returns a Response carrying short code
     short_code = "print('hello')"
-    mock_response = Response(type=OutputType.RESPONSE, text=short_code)
-
-    # Mock parser.parse() to return Response
-    parser.parse.return_value = mock_response
+    parser = StubParser(Response(type=OutputType.RESPONSE, text=short_code))
 
-    # Mock responder.format() to return message WITHOUT markers
+    # format() returns a message WITHOUT markers
     formatted_message = "Here's the output:\n```python\ncode\n```"
-    responder.format.return_value = formatted_message
-
-    # Mock responder.send_with_attachments (should NOT be called)
-    responder.send_with_attachments = AsyncMock()
+    responder = StubResponder(formatted_message)
 
     # Mock bridge response
-    async def mock_read_response():
-        yield "Here's the code"
+    response_lines = [
+        "Here's the code",
+    ]
 
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
+    bridge = StubBridge(response_lines)
 
     orchestrator = ClaudeOrchestrator(bridge, parser, responder, send_signal)
 
@@ -280,31 +356,26 @@ async def test_execute_command_without_attachment_markers():
 
     # Assert
     # Verify send_with_attachments was NOT called
-    responder.send_with_attachments.assert_not_called()
+    assert responder.attachment_calls == []
 
     # Verify send_signal was called with message containing formatted output
-    send_signal.assert_called()
-    final_call = send_signal.call_args_list[-1]
-    final_message = final_call[0][1]
+    assert send_signal.call_count >= 1
+    final_message = send_signal.call_args_list[-1].args[1]
     assert "```python" in final_message or "code" in final_message
 
 
-@pytest.mark.asyncio
-async def test_execute_custom_command():
+async def test_execute_custom_command(parser, responder):
     """Test custom command execution sends formatted command to bridge."""
     # Arrange
-    bridge = Mock()
-    parser = OutputParser()
-    responder = SignalResponder()
-    send_signal = AsyncMock()
+    send_signal = RecordingAsyncCall()
 
     # Mock bridge response
-    async def mock_read_response():
-        yield "Executing custom command..."
-        yield "Command completed!"
+    response_lines = [
+        "Executing custom command...",
+        "Command completed!",
+    ]
 
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
+    bridge = StubBridge(response_lines)
 
     orchestrator = ClaudeOrchestrator(bridge, parser, responder, send_signal)
 
@@ -316,27 +387,23 @@ async def test_execute_custom_command():
     )
 
     # Assert - command should be formatted as /command args and sent to bridge
-    bridge.send_command.assert_called_once_with("/gsd:plan my-project high-priority")
+    assert bridge.send_command.call_args_list == [call("/gsd:plan my-project high-priority")]
 
 
-@pytest.mark.asyncio
-async def test_execute_custom_command_streams_response():
+async def test_execute_custom_command_streams_response(parser, responder):
     """Test custom command responses are streamed to Signal."""
     # Arrange
-    bridge = Mock()
-    parser = OutputParser()
-    responder = SignalResponder()
-    send_signal = AsyncMock()
+    send_signal = RecordingAsyncCall()
 
     # Mock bridge response with multiple lines
-    async def mock_read_response():
-        yield "Creating project plan..."
-        yield "Using Read tool on context.md"
-        yield "Generated plan structure"
-        yield "Done!"
+    response_lines = [
+        "Creating project plan...",
+        "Using Read tool on context.md",
+        "Generated plan structure",
+        "Done!",
+    ]
 
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
+    bridge = StubBridge(response_lines)
 
     orchestrator = ClaudeOrchestrator(bridge, parser, responder, send_signal)
 
@@ -347,31 +414,23 @@ async def test_execute_custom_command_streams_response():
         thread_id="thread-456"
     )
 
-    # Assert - responses should be sent to Signal
-    assert send_signal.call_count >= 1
-    calls = send_signal.call_args_list
-    messages = [call[0][1] for call in calls]
-    combined = "\n".join(messages)
-
+    # Assert - responses should be sent to Signal, batched into one message
+    assert send_signal.call_count == 1
     # Should contain tool emoji and responses
-    assert "📖" in combined  # Read tool
-    assert "Done!" in combined or "plan" in combined.lower()
+    assert any_contains(send_signal, "📖")  # Read tool
+    assert any_contains(send_signal, "Done!") or any_contains(send_signal, "plan", ignore_case=True)
 
 
-@pytest.mark.asyncio
-async def test_execute_custom_command_no_args():
+async def test_execute_custom_command_no_args(parser, responder):
     """Test custom command execution without arguments."""
     # Arrange
-    bridge = Mock()
-    parser = OutputParser()
-    responder = SignalResponder()
-    send_signal = AsyncMock()
+    send_signal = RecordingAsyncCall()
 
-    async def mock_read_response():
-        yield "Command executed"
+    response_lines = [
+        "Command executed",
+    ]
 
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
+    bridge = StubBridge(response_lines)
 
     orchestrator = ClaudeOrchestrator(bridge, parser, responder, send_signal)
 
@@ -383,11 +442,10 @@ async def test_execute_custom_command_no_args():
     )
 
     # Assert - command sent without args (just slash + name)
-    bridge.send_command.assert_called_once_with("/simple:cmd ")
+    assert bridge.send_command.call_args_list == [call("/simple:cmd ")]
 
 
-@pytest.mark.asyncio
-async def test_execute_command_bridge_none():
+async def test_execute_command_bridge_none(parser, responder):
     """
     Test execute_command when bridge is None.
 
@@ -398,9 +456,7 @@ async def test_execute_command_bridge_none():
     4. Returns early without crashing
     """
     # Arrange
-    parser = OutputParser()
-    responder = SignalResponder()
-    send_signal = AsyncMock()
+    send_signal = RecordingAsyncCall()
 
     # Create orchestrator with bridge=None
     orchestrator = ClaudeOrchestrator(
@@ -416,16 +472,11 @@ async def test_execute_command_bridge_none():
     # Assert
     # Should send error message to Signal
     assert send_signal.call_count >= 1
-    calls = send_signal.call_args_list
-    messages = [call[0][1] for call in calls]
-    combined = "\n".join(messages)
-
     # Error should mention no active session or similar
-    assert "Error" in combined or "❌" in combined or "session" in combined.lower()
+    assert any_contains(send_signal, "Error", "❌") or any_contains(send_signal, "session", ignore_case=True)
 
 
-@pytest.mark.asyncio
-async def test_approval_timeout_during_execution():
+async def test_approval_timeout_during_execution(parser, responder):
     """
     Test approval request timeout handling.
 
@@ -436,38 +487,25 @@ async def test_approval_timeout_during_execution():
     4. Subsequent operations continue
     """
     # Arrange
-    bridge = Mock()
-    parser = OutputParser()
-    responder = SignalResponder()
-    send_signal = AsyncMock()
-
-    # Mock approval workflow
-    approval_workflow = Mock()
-
-    # Mock intercept to require approval
-    approval_workflow.intercept.return_value = (False, "approval-123")
+    send_signal = RecordingAsyncCall()
 
-    # Mock detector
-    approval_workflow.detector = Mock()
-    approval_workflow.detector.classify.return_value = (False, "Destructive: Write operation")
+    # wait_for_approval resolves immediately as a timeout/rejection
+    wait_for_approval = RecordingAsyncCall(return_value=False)
 
-    # Mock format_approval_message
-    approval_workflow.format_approval_message.return_value = "Approval required for Write tool"
-
-    # Mock wait_for_approval to simulate timeout (return False)
-    async def mock_wait():
-        await asyncio.sleep(0.1)  # Simulate wait time
-        return False  # Timeout/rejection
-
-    approval_workflow.wait_for_approval = mock_wait
+    # Approval workflow requiring approval for the Write tool call
+    approval_workflow = StubApprovalWorkflow(
+        wait_for_approval=wait_for_approval,
+        detector=StubDetector("Destructive: Write operation"),
+        message="Approval required for Write tool",
+    )
 
     # Mock bridge response with a destructive tool call
-    async def mock_read_response():
-        yield "Using Write tool on critical_file.py"
-        yield "Continuing with next operation..."
+    response_lines = [
+        "Using Write tool on critical_file.py",
+        "Continuing with next operation...",
+    ]
 
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
+    bridge = StubBridge(response_lines)
 
     orchestrator = ClaudeOrchestrator(
         bridge=bridge,
@@ -481,16 +519,52 @@ async def test_approval_timeout_during_execution():
     await orchestrator.execute_command("dangerous command", "session-456", "+1234567890")
 
     # Assert
-    calls = send_signal.call_args_list
-    messages = [call[0][1] for call in calls]
-    combined = "\n".join(messages)
+    assert wait_for_approval.call_args_list == [call("approval-123")]
+
+    # The prompt and the rejection notice are each sent right away; the
+    # remaining output goes out at the end of the stream
+    assert send_signal.call_count == 3
+    prompt, notice, _ = (c.args[1] for c in send_signal.call_args_list)
+    assert prompt == "Approval required for Write tool"
 
     # Should contain rejection message
-    assert "rejected" in combined.lower() or "timed out" in combined.lower() or "❌" in combined
+    assert "skipping Write" in notice
+    assert any_contains(send_signal, "rejected", "timed out", "❌", ignore_case=True)
 
 
-@pytest.mark.asyncio
-async def test_custom_command_not_found():
+async def test_rejection_notice_sent_before_stream_error(parser, responder):
+    """Test a rejection notice still reaches Signal when the stream then fails."""
+    # Arrange
+    send_signal = RecordingAsyncCall()
+    approval_workflow = StubApprovalWorkflow(
+        wait_for_approval=RecordingAsyncCall(return_value=False),
+        detector=StubDetector("Destructive: Write operation"),
+        message="Approval required for Write tool",
+    )
+    bridge = StubBridge([
+        "Using Write tool on critical_file.py",
+        ConnectionError("WebSocket connection lost"),
+    ])
+
+    orchestrator = ClaudeOrchestrator(
+        bridge=bridge,
+        parser=parser,
+        responder=responder,
+        send_signal=send_signal,
+        approval_workflow=approval_workflow
+    )
+
+    # Act
+    await orchestrator.execute_command("dangerous command", "session-456", "+1234567890")
+
+    # Assert - prompt, rejection notice, then the error
+    assert send_signal.call_count == 3
+    _, notice, error = (c.args[1] for c in send_signal.call_args_list)
+    assert "skipping Write" in notice
+    assert "connection lost" in error
+
+
+async def test_custom_command_not_found(parser, responder):
     """
     Test execute_custom_command for non-existent command.
 
@@ -500,18 +574,15 @@ async def test_custom_command_not_found():
     3. User is notified of the error
     """
     # Arrange
-    bridge = Mock()
-    parser = OutputParser()
-    responder = SignalResponder()
-    send_signal = AsyncMock()
+    send_signal = RecordingAsyncCall()
 
     # Mock bridge response indicating command not found
-    async def mock_read_response():
-        yield "Error: Command '/nonexistent:cmd' not recognized"
-        yield "Available commands: /help, /session, /thread"
+    response_lines = [
+        "Error: Command '/nonexistent:cmd' not recognized",
+        "Available commands: /help, /session, /thread",
+    ]
 
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
+    bridge = StubBridge(response_lines)
 
     orchestrator = ClaudeOrchestrator(
         bridge=bridge,
@@ -529,17 +600,12 @@ async def test_custom_command_not_found():
 
     # Assert
     # Command should be sent to bridge (validation happens there)
-    bridge.send_command.assert_called_once_with("/nonexistent:cmd some args")
+    assert bridge.send_command.call_args_list == [call("/nonexistent:cmd some args")]
 
     # Error response should be sent to Signal
-    calls = send_signal.call_args_list
-    messages = [call[0][1] for call in calls]
-    combined = "\n".join(messages)
-
-    assert "Error" in combined or "not recognized" in combined or "❌" in combined
+    assert any_contains(send_signal, "Error", "not recognized", "❌")
 
 
-@pytest.mark.asyncio
 async def test_response_formatting_with_null_output():
     """
     Test response formatting when parser returns None or empty output.
@@ -550,24 +616,19 @@ async def test_response_formatting_with_null_output():
     3. Execution continues
     """
     # Arrange
-    bridge = Mock()
-    parser = Mock()
-    responder = Mock()
-    send_signal = AsyncMock()
+    send_signal = RecordingAsyncCall()
 
-    # Mock parser to return None
-    parser.parse.return_value = None
-
-    # Mock responder.format to handle None gracefully
-    responder.format.return_value = ""  # Empty formatted message
+    # Parser returns None; format() handles it with an empty message
+    parser = StubParser(None)
+    responder = StubResponder("")
 
     # Mock bridge response
-    async def mock_read_response():
-        yield "Some output"
-        yield "More output"
+    response_lines = [
+        "Some output",
+        "More output",
+    ]
 
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
+    bridge = StubBridge(response_lines)
 
     orchestrator = ClaudeOrchestrator(
         bridge=bridge,
@@ -581,14 +642,13 @@ async def test_response_formatting_with_null_output():
 
     # Assert
     # Parser should have been called
-    assert parser.parse.call_count >= 1
+    assert parser.calls >= 1
 
-    # send_signal might be called but with empty messages (which get filtered in batcher)
-    # The key is no exception was raised
+    # Empty formatted messages are dropped rather than sent
+    assert send_signal.call_count == 0
 
 
-@pytest.mark.asyncio
-async def test_bridge_read_exception():
+async def test_bridge_read_exception(parser, responder):
     """
     Test bridge.read_response() raising exception mid-stream.
 
@@ -599,23 +659,19 @@ async def test_bridge_read_exception():
     4. Error notification sent if notification_manager available
     """
     # Arrange
-    bridge = Mock()
-    parser = OutputParser()
-    responder = SignalResponder()
-    send_signal = AsyncMock()
-    notification_manager = Mock()
-    notification_manager.notify = AsyncMock()
+    send_signal = RecordingAsyncCall()
+    notification_manager = StubNotificationManager()
 
     # Mock bridge to raise exception mid-stream
-    async def mock_read_response():
-        yield "Starting operation..."
-        yield "Processing file 1..."
-        raise ConnectionError("WebSocket connection lost")
+    response_lines = [
+        "Starting operation...",
+        "Processing file 1...",
+        ConnectionError("WebSocket connection lost"),
         # Should never reach here
-        yield "Should not see this"
+        "Should not see this",
+    ]
 
-    bridge.send_command = AsyncMock()
-    bridge.read_response = mock_read_response
+    bridge = StubBridge(response_lines)
 
     orchestrator = ClaudeOrchestrator(
         bridge=bridge,
@@ -635,14 +691,10 @@ async def test_bridge_read_exception():
 
     # Assert
     # Error message should be sent to Signal
-    calls = send_signal.call_args_list
-    messages = [call[0][1] for call in calls]
-    combined = "\n".join(messages)
-
-    assert "Error" in combined or "connection" in combined.lower() or "❌" in combined
+    assert any_contains(send_signal, "Error", "❌") or any_contains(send_signal, "connection", ignore_case=True)
 
     # Error notification should be sent
-    notification_manager.notify.assert_called()
-    notify_call = notification_manager.notify.call_args
-    assert notify_call[1]["event_type"] == "error"
-    assert "connection" in notify_call[1]["details"]["error"].lower()
+    assert notification_manager.notify.call_count >= 1
+    notify_call = notification_manager.notify.call_args_list[-1]
+    assert notify_call.kwargs["event_type"] == "error"
+    assert "connection" in notify_call.kwargs["details"]["error"].lower()
@@ -152,6 +152,13 @@ class TestMessageBatcher:
         assert messages[0] == "Message 1"
         assert messages[1] == "Message 2"
 
+    def test_add_skips_empty_message(self):
+        """Empty messages are not buffered."""
+        batcher = MessageBatcher()
+        batcher.add("")
+        batcher.add("Message 1")
+        assert batcher.flush() == ["Message 1"]
+
     def test_flush_clears_buffer(self):
         """Flush clears the buffer."""
         batcher = MessageBatcher()
@@ -243,3 +243,56 @@ class TestSessionManager:
         # Verify retrieval
         retrieved = await manager.get(session.id)
         assert retrieved.context == {}
+
+    @pytest.mark.asyncio
+    async def test_initialize_is_idempotent(self, manager):
+        """
+        Test initialize() on an open manager keeps the existing connection.
+
+        Expected behavior:
+        - Connection object unchanged
+        - Existing sessions still readable
+        """
+        session = await manager.create("/project", "thread")
+        connection = manager._connection
+
+        await manager.initialize()
+
+        assert manager._connection is connection
+        assert await manager.get(session.id) is not None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("project_path", [
+        "/project\x00evil",
+        "/project\nevil",
+        "/project\r\nevil",
+    ])
+    async def test_create_rejects_nul_and_line_breaks(self, manager, project_path):
+        """
+        Test create() rejects paths containing NUL or line breaks.
+
+        Expected behavior:
+        - ValueError raised before anything is written
+        - No session stored
+        """
+        with pytest.raises(ValueError):
+            await manager.create(project_path, "thread")
+
+        assert await manager.list() == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("project_path", [
+        "/home/user/R&D",
+        "/home/user/$work",
+        "/home/user/what?",
+        "/home/user/*draft*",
+    ])
+    async def test_create_accepts_shell_characters_in_path(self, manager, project_path):
+        """
+        Test create() accepts legal directory names with shell characters.
+
+        Paths are never passed through a shell, so these are stored as-is.
+        """
+        session = await manager.create(project_path, "thread")
+
+        assert (await manager.get(session.id)).project_path == project_path
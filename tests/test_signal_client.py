@@ -9,6 +9,24 @@ from src.signal.client import SignalClient
 from src.signal.reconnection import ConnectionState
 
 
+def mock_response(status=200, text=""):
+    """Response mock usable as `async with session.get(...) as resp`."""
+    response = AsyncMock()
+    response.status = status
+    response.text = AsyncMock(return_value=text)
+    response.__aenter__.return_value = response
+    response.__aexit__.return_value = None
+    return response
+
+
+def failing_request(error):
+    """Request context manager whose `async with` raises error."""
+    request = MagicMock()
+    request.__aenter__ = AsyncMock(side_effect=error)
+    request.__aexit__ = AsyncMock(return_value=None)
+    return request
+
+
 class TestAutoReconnect:
     """Test automatic reconnection after connection failures."""
 
@@ -219,16 +237,8 @@ class TestReceiveMessagesReconnection:
         client._connected = True
         client.reconnection_manager.state = ConnectionState.CONNECTED
 
-        # Create a mock context manager that raises ClientError
-        class MockContextManager:
-            async def __aenter__(self):
-                raise ClientError("Connection lost")
-
-            async def __aexit__(self, exc_type, exc_val, exc_tb):
-                return None
-
-        # Mock session.get to return our context manager
-        mock_session.get = MagicMock(return_value=MockContextManager())
+        # Mock session.get to raise ClientError
+        mock_session.get = MagicMock(return_value=failing_request(ClientError("Connection lost")))
 
         # Mock auto_reconnect to track if it was called
         reconnect_called = False
@@ -417,15 +427,10 @@ class TestErrorHandling:
             mock_session = MagicMock()
             mock_session_class.return_value = mock_session
 
-            # Create a mock context manager that raises a generic exception
-            class MockContextManager:
-                async def __aenter__(self):
-                    raise OSError("Connection refused")
-
-                async def __aexit__(self, exc_type, exc_val, exc_tb):
-                    return None
-
-            mock_session.get = MagicMock(return_value=MockContextManager())
+            # Health check raises a generic exception
+            mock_session.get = MagicMock(
+                return_value=failing_request(OSError("Connection refused"))
+            )
             mock_session.close = AsyncMock()
 
             # Attempt connection (should fail)
@@ -474,13 +479,8 @@ class TestConnectionLifecycle:
             mock_session = MagicMock()
             mock_session_class.return_value = mock_session
 
-            # Create a mock response for health check
-            mock_response = AsyncMock()
-            mock_response.status = 200
-            mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-            mock_response.__aexit__ = AsyncMock(return_value=None)
-
-            mock_session.get = MagicMock(return_value=mock_response)
+            # Health check succeeds
+            mock_session.get = MagicMock(return_value=mock_response(200))
 
             # Connect should succeed
             await client.connect()
@@ -527,12 +527,7 @@ class TestRateLimiting:
         client._rate_limiter.acquire = AsyncMock(return_value=0.5)
 
         # Mock HTTP response
-        mock_response = AsyncMock()
-        mock_response.status = 200
-        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_response.__aexit__ = AsyncMock(return_value=None)
-
-        mock_session.post = MagicMock(return_value=mock_response)
+        mock_session.post = MagicMock(return_value=mock_response(200))
 
         # Send message
         await client.send_message("+1234567890", "test message")
@@ -557,13 +552,9 @@ class TestRateLimiting:
         client._rate_limiter.acquire = AsyncMock(return_value=0)
 
         # Mock HTTP response with error
-        mock_response = AsyncMock()
-        mock_response.status = 500
-        mock_response.text = AsyncMock(return_value="Internal Server Error")
-        mock_response.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_response.__aexit__ = AsyncMock(return_value=None)
-
-        mock_session.post = MagicMock(return_value=mock_response)
+        mock_session.post = MagicMock(
+            return_value=mock_response(500, "Internal Server Error")
+        )
 
         # Send message should raise RuntimeError
         with pytest.raises(RuntimeError, match="Failed to send message: HTTP 500"):
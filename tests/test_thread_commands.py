@@ -70,6 +70,18 @@ async def test_thread_map_rejects_nonexistent_path(thread_commands, mock_mapper)
     assert bad_path in result
 
 
+@pytest.mark.asyncio
+async def test_thread_map_rejects_file_path(thread_commands, mock_mapper, tmp_path):
+    """Test /thread map returns error when path is a file, not a directory."""
+    file_path = tmp_path / "notes.txt"
+    file_path.write_text("not a project")
+
+    result = await thread_commands.handle("abc123de", f"/thread map {file_path}")
+
+    assert "not a directory" in result
+    mock_mapper.map.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_thread_map_rejects_duplicate_thread(thread_commands, mock_mapper, tmp_path):
     """Test /thread map returns error if thread already mapped."""
@@ -69,6 +69,16 @@ async def test_map_rejects_nonexistent_path(mapper, nonexistent_path):
         await mapper.map(thread_id, nonexistent_path)
 
 
+@pytest.mark.asyncio
+async def test_map_rejects_file_path(mapper, temp_project_dir):
+    """Test that map() raises ThreadMappingError if path is a regular file."""
+    file_path = Path(temp_project_dir) / "README.md"
+    file_path.write_text("not a project")
+
+    with pytest.raises(ThreadMappingError, match="not a directory"):
+        await mapper.map("thread-789", str(file_path))
+
+
 @pytest.mark.asyncio
 async def test_map_rejects_duplicate_thread(mapper, temp_project_dir):
     """Test that map() raises ThreadMappingError if thread already mapped."""